@@ -0,0 +1,127 @@
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# (host pattern, path pattern, fixture file) — first match wins
+ROUTES = [
+    (r"cv-library\.co\.uk$", r".*", "cvlibrary_listing.html"),
+    (r"cwjobs\.co\.uk$", r".*", "cwjobs_listing.html"),
+    (r"jobserve\.com$", r".*", "jobserve_listing.html"),
+    (r"reed\.co\.uk$", r"^/jobs/[^/]+/\d+", "reed_detail.html"),
+    (r"reed\.co\.uk$", r".*", "reed_listing.html"),
+    (r"indeed\.com$", r"^/viewjob", "indeed_detail.html"),
+    (r"indeed\.com$", r".*", "indeed_listing.html"),
+    (r"linkedin\.com$", r"^/jobs/view/", "linkedin_detail.html"),
+    (r"linkedin\.com$", r".*", "linkedin_listing.html"),
+]
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FakeBroker:
+    """
+    Local stand-in for FlareSolverr's /v1 JSON API.
+
+    Serves the saved fixtures for request.get / request.post after `latency`
+    seconds, and accepts sessions.create / sessions.destroy / sessions.list.
+    """
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.requests = 0
+        self._fixtures = {name: load_fixture(name) for _, _, name in ROUTES}
+        self._sessions = set()
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def route(self, url):
+        parsed = urlparse(url)
+        for host_re, path_re, name in ROUTES:
+            if re.search(host_re, parsed.hostname or "") and re.search(path_re, parsed.path):
+                return self._fixtures[name]
+        return None
+
+    def handle(self, payload):
+        cmd = payload.get("cmd", "")
+        if cmd == "sessions.create":
+            with self._lock:
+                self._sessions.add(payload.get("session"))
+            return 200, {"status": "ok", "session": payload.get("session")}
+        if cmd == "sessions.destroy":
+            with self._lock:
+                self._sessions.discard(payload.get("session"))
+            return 200, {"status": "ok"}
+        if cmd == "sessions.list":
+            with self._lock:
+                return 200, {"status": "ok", "sessions": sorted(self._sessions)}
+        if cmd not in ("request.get", "request.post"):
+            return 500, {"status": "error", "message": f"Unknown cmd {cmd}"}
+
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency)
+        body = self.route(payload.get("url", ""))
+        if body is None:
+            return 200, {"status": "ok", "solution": {"url": payload["url"], "status": 404, "response": ""}}
+        return 200, {"status": "ok", "solution": {"url": payload["url"], "status": 200, "response": body}}
+
+    def _handler(self):
+        broker = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    status, body = 400, {"status": "error", "message": "Invalid JSON"}
+                else:
+                    status, body = broker.handle(payload)
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve bench fixtures over the broker /v1 protocol")
+    parser.add_argument("--port", type=int, default=8191)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    args = parser.parse_args()
+    broker = FakeBroker(latency=args.latency, port=args.port)
+    print(f"[✓] Fake broker listening on {broker.url}")
+    broker.server.serve_forever()
@@ -0,0 +1,61 @@
+import threading
+
+from src import db
+
+
+class MemoryJobs:
+    """
+    In-memory jobs table for benchmarks.
+
+    Follows the same rules as db.upsert_jobs: rows are keyed by link, a NULL
+    description keeps the stored one (as does a snippet for an enriched
+    job), and only rows whose content hash or enrichment flag changed count
+    as changed.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self._lock = threading.Lock()
+
+    def upsert_jobs(self, pool, rows, batch_size=500, on_commit=None):
+        counts = {"new": 0, "changed": 0, "unchanged": 0, "failed": 0}
+        for batch in db.batched(rows, batch_size):
+            unique = {row[3]: row for row in batch}
+            written = 0
+            with self._lock:
+                for link, row in unique.items():
+                    fields = dict(zip(db.ROW_COLUMNS, row))
+                    existing = self.rows.get(link)
+                    if existing:
+                        # snippets never replace a stored full description (see db._DESCRIPTION_SQL)
+                        enriched = not existing["needs_enrichment"] and existing["description"] is not None
+                        if fields["description"] is None or (fields["needs_enrichment"] and enriched):
+                            fields["description"] = existing["description"]
+                        fields["needs_enrichment"] = fields["needs_enrichment"] and not enriched
+                        fields["canonical_link"] = fields["canonical_link"] or existing["canonical_link"]
+                    digest = db.content_hash(*(fields[name] for name in db.HASHED_COLUMNS))
+                    if existing and (existing["content_hash"], existing["needs_enrichment"], existing["canonical_link"]) == (
+                        digest, fields["needs_enrichment"], fields["canonical_link"]
+                    ):
+                        continue
+                    counts["changed" if existing else "new"] += 1
+                    written += 1
+                    self.rows[link] = {**fields, "content_hash": digest}
+            if on_commit:
+                on_commit(list(unique))
+            counts["unchanged"] += len(batch) - written
+        return counts
+
+    def known_links(self, pool, links):
+        with self._lock:
+            return {link for link in links if link in self.rows}
+
+
+def install(store=None):
+    """Route BaseClient's pool, schema and bulk-writer calls to an in-memory store."""
+    store = store or MemoryJobs()
+    db.get_pg_pool = lambda pg_url=None: store
+    db.ensure_schema = lambda pool, force=False: None
+    db.upsert_jobs = store.upsert_jobs
+    db.known_links = store.known_links
+    return store
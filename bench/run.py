@@ -0,0 +1,147 @@
+"""
+Offline benchmark for the scraper pipeline.
+
+Runs every source against saved fixtures served by a local fake broker, so
+no live site or FlareSolverr instance is touched:
+
+    python -m bench.run                       # in-memory DB, no broker latency
+    python -m bench.run --latency 0.5         # simulate a slow broker
+    python -m bench.run --db postgres         # write to POSTGRES_URL instead
+    python -m bench.run --json bench.json     # also save the report
+
+Reports listing pages/sec parsed, jobs/sec upserted and end-to-end wall time
+per scraper. CVLibrary, CWJobs and JobServe have no detail stage, so they
+only have listing fixtures.
+"""
+import argparse
+import json
+import os
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmark")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake broker latency per request (s)")
+    parser.add_argument("--iterations", type=int, default=200, help="parse iterations per source")
+    parser.add_argument("--jobs", type=int, default=5000, help="synthetic jobs for the upsert benchmark")
+    parser.add_argument("--db", choices=["memory", "postgres"], default="memory")
+    parser.add_argument("--redis", action="store_true", help="use REDIS_URL (seen-link cache) instead of disabling it")
+    parser.add_argument("--sources", nargs="*", help="subset of sources to run (SOURCE names), e.g. Reed LinkedIn")
+    parser.add_argument("--json", help="write the report to this file")
+    return parser.parse_args()
+
+
+def configure_env(args, broker_url):
+    # must happen before src is imported: these are read at import time
+    os.environ["BROKER_URL"] = broker_url
+    os.environ.setdefault("HOST_RATE", "100000")
+    os.environ.setdefault("HOST_BURST", "100000")
+    # keep fixture pages out of the real page archive
+    os.environ.setdefault("ARCHIVE_PAGES", "0")
+    if not args.redis:
+        os.environ["SEEN_TTL"] = "0"
+        os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+
+
+def offline(ScraperClass):
+    """Subclass that never leaves the fake broker (no direct-HTTP fast path)."""
+    return type(ScraperClass.__name__, (ScraperClass,), {"FETCH_STRATEGY": "broker"})
+
+
+def bench_parse(scraper, listing, iterations):
+    # parse only: the detail stage is measured end to end instead
+    cards = len(scraper.parse(listing))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        scraper.parse(listing)
+    elapsed = time.perf_counter() - start
+    return {"cards_per_page": cards, "pages_per_sec": iterations / elapsed if elapsed else 0.0}
+
+
+def bench_upsert(scraper, n):
+    jobs = [
+        {
+            "company": f"Bench Co {i % 50}",
+            "title": f"Django Contractor #{i}",
+            "description": "Synthetic benchmark description. " * 20,
+            "url": f"https://bench.invalid/job/{i}",
+        }
+        for i in range(n)
+    ]
+    report = {}
+    for label in ("first_write", "rewrite_unchanged"):
+        start = time.perf_counter()
+        counts = scraper.write_jobs(jobs)
+        elapsed = time.perf_counter() - start
+        report[label] = {"jobs_per_sec": n / elapsed if elapsed else 0.0, **counts}
+    return report
+
+
+def main():
+    args = parse_args()
+
+    from bench.fake_broker import FakeBroker, load_fixture
+
+    broker = FakeBroker(latency=args.latency).start()
+    configure_env(args, broker.url)
+
+    if args.db == "memory":
+        from bench import memory_db
+        memory_db.install()
+
+    import main as pipeline
+    from src import broker as broker_client, db, parsing, sessions
+
+    fixtures = {
+        "CVLibrary": "cvlibrary_listing.html",
+        "CWJobs": "cwjobs_listing.html",
+        "JobServe": "jobserve_listing.html",
+        "Reed": "reed_listing.html",
+        "Indeed": "indeed_listing.html",
+        "LinkedIn": "linkedin_listing.html",
+    }
+    selected = [(n, c) for n, c in pipeline.SCRAPERS if not args.sources or n in args.sources]
+
+    report = {"parser_backend": parsing.BACKEND, "db": args.db, "latency": args.latency, "sources": {}}
+    try:
+        for name, ScraperClass in selected:
+            scraper = offline(ScraperClass)()
+            listing = load_fixture(fixtures[name])
+            before = broker.requests
+            start = time.perf_counter()
+            summary = scraper.run()
+            wall = time.perf_counter() - start
+            report["sources"][name] = {
+                "parse": bench_parse(scraper, listing, args.iterations),
+                "end_to_end": {"wall_time": wall, "broker_requests": broker.requests - before, **summary},
+            }
+
+        first = offline(selected[0][1])() if selected else None
+        if first:
+            report["upsert"] = bench_upsert(first, args.jobs)
+    finally:
+        sessions.close_all()
+        broker_client.close()
+        db.close_pools()
+        broker.stop()
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[✓] Report written to {args.json}")
+
+
+def print_report(report):
+    print(f"\nParser backend: {report['parser_backend']} | DB: {report['db']} | broker latency: {report['latency']}s\n")
+    print(f"{'Source':<12}{'Cards':>7}{'Pages/s':>11}{'Requests':>10}{'Wall':>9}")
+    for name, r in report["sources"].items():
+        p, e = r["parse"], r["end_to_end"]
+        print(f"{name:<12}{p['cards_per_page']:>7}{p['pages_per_sec']:>11.1f}{e['broker_requests']:>10}{e['wall_time']:>8.2f}s")
+    for label, u in report.get("upsert", {}).items():
+        print(f"\nUpsert ({label}): {u['jobs_per_sec']:.0f} jobs/s "
+              f"(new {u['new']}, changed {u['changed']}, unchanged {u['unchanged']}, failed {u['failed']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,317 @@
+import argparse
+import os
+import signal
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from src import (
-    cvlibrary, cwjobs, jobserve, reed, indeed, linkedin
+    cvlibrary, cwjobs, jobserve, reed, indeed, linkedin, archive, broker, db, enrichment, export, metrics, profiling,
+    scheduler, search, sessions, workqueue,
 )
 
+# (SOURCE, scraper class): every subcommand, --sources flag and summary uses the SOURCE name
+SCRAPERS = [
+    (cls.SOURCE, cls)
+    for cls in (
+        cvlibrary.CVLibraryScraper,
+        cwjobs.CWJobsScraper,
+        jobserve.JobServeScraper,
+        reed.ReedScraper,
+        indeed.IndeedScraper,
+        linkedin.LinkedInScraper,
+    )
+]
 
-def run_all():
+
+def run_source(name, ScraperClass):
+    """Run a single scraper in isolation and return its result summary."""
     start = time.time()
-    print("🚀 Starting job scraper pipeline...\n")
+    summary = {"source": name, "parsed": 0, "new": 0, "changed": 0, "unchanged": 0, "failed": 0, "elapsed": 0.0, "error": None}
+    print(f"\n--- Running {name} ---")
+    try:
+        scraper = ScraperClass()
+        summary.update(scraper.run() or {})
+    except Exception as e:
+        summary["error"] = str(e)
+        print(f"[!] {name} failed: {e}")
+    summary["elapsed"] = time.time() - start
+    return summary
 
-    scrapers = [
-        ("CVLibrary", cvlibrary.CVLibraryScraper),
-        ("CWJobs", cwjobs.CWJobsScraper),
-        ("JobServe", jobserve.JobServeScraper),
-        ("Reed", reed.ReedScraper),
-        ("Indeed", indeed.IndeedScraper),
-        ("Linkedin", linkedin.LinkedInScraper)
-    ]
 
-    total_inserted = 0
+def print_summary(results):
+    print(f"\n{'Source':<12}{'Parsed':>8}{'New':>6}{'Changed':>9}{'Unchanged':>11}{'Failed':>8}{'Time':>9}")
+    for r in results:
+        status = f"  ✗ {r['error']}" if r["error"] else ""
+        print(f"{r['source']:<12}{r['parsed']:>8}{r['new']:>6}{r['changed']:>9}{r['unchanged']:>11}{r['failed']:>8}{r['elapsed']:>8.2f}s{status}")
 
-    for name, ScraperClass in scrapers:
-        print(f"\n--- Running {name} ---")
-        try:
-            scraper = ScraperClass()
-            scraper.run()
-            total_inserted += 1
-        except Exception as e:
-            print(f"[!] {name} failed: {e}")
+
+def run_all(workers=None):
+    """
+    Run every scraper, each source in its own worker.
+
+    Args:
+        workers: number of sources to run at once (default: one per source,
+                 or SCRAPER_WORKERS). Use 1 for the old sequential behaviour.
+    """
+    start = time.time()
+    workers = workers or int(os.getenv("SCRAPER_WORKERS", len(SCRAPERS)))
+    print(f"🚀 Starting job scraper pipeline ({workers} workers)...\n")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_source, name, cls): name for name, cls in SCRAPERS}
+        results = [f.result() for f in as_completed(futures)]
+
+    order = [name for name, _ in SCRAPERS]
+    results.sort(key=lambda r: order.index(r["source"]))
+    print_summary(results)
 
     print(f"\n✅ All scrapers finished in {time.time() - start:.2f}s")
-    print(f"Total sources processed: {total_inserted}")
+    print(f"Total jobs new: {sum(r['new'] for r in results)}, changed: {sum(r['changed'] for r in results)}")
+    return results
+
+
+def queue_scrapers(sources=None):
+    """Scraper classes keyed by SOURCE, optionally limited to `sources`."""
+    return {source: cls for source, cls in SCRAPERS if not sources or source in sources}
+
+
+def work_queue():
+    """The shared Redis work queue; exits with a clear message when Redis is unreachable."""
+    client = db.get_redis()
+    if client is None:
+        raise SystemExit("[!] Redis required for the work queue (check REDIS_URL)")
+    return workqueue.WorkQueue(client)
+
+
+def run_workers(sources=None, threads=1, idle_exit=False):
+    queue = work_queue()
+    workers = [workqueue.Worker(queue, queue_scrapers(sources)) for _ in range(threads)]
+    print(f"👷 Starting {threads} queue worker(s)...")
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        try:
+            for f in [pool.submit(w.run, idle_exit) for w in workers]:
+                f.result()
+        except KeyboardInterrupt:
+            for w in workers:
+                w.stop()
+
+
+def run_enricher(sources=None, workers=None, idle_exit=False):
+    enricher = enrichment.Enricher(queue_scrapers(sources), workers or enrichment.ENRICH_WORKERS)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: enricher.stop())
+    enricher.run(idle_exit)
+
+
+def print_enrichment_backlog():
+    backlog = db.enrichment_backlog(db.get_pg_pool(), enrichment.ENRICH_MAX_ATTEMPTS)
+    for source, counts in backlog.items():
+        print(f"{source:<12} pending={counts['pending']} gave_up={counts['gave_up']}")
+    if not backlog:
+        print("[i] No jobs waiting for enrichment")
+
+
+def run_daemon(concurrency=None):
+    """
+    Keep crawling every source on its own adaptive interval until SIGINT/SIGTERM.
+
+    With DEFER_DETAILS an enrichment worker runs alongside the crawls.
+    """
+    daemon = scheduler.Scheduler(SCRAPERS, run_source, db.get_redis(), concurrency or scheduler.SCHEDULER_CONCURRENCY)
+    deferred = {source: cls for source, cls in queue_scrapers().items() if cls.HAS_DETAIL and cls.DEFER_DETAILS}
+    enricher = enrichment.Enricher(deferred) if deferred else None
+
+    def stop(*_):
+        daemon.stop()
+        if enricher:
+            enricher.stop()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, stop)
+    thread = threading.Thread(target=enricher.run, name="enricher", daemon=True) if enricher else None
+    if thread:
+        thread.start()
+    daemon.run()
+    if thread:
+        thread.join()
+
+
+def print_search(args):
+    since = datetime.fromisoformat(args.since) if args.since else None
+    until = datetime.fromisoformat(args.until) if args.until else None
+    rows, cursor = search.search_jobs(
+        db.get_pg_pool(), args.query, args.source, since, until,
+        limit=args.limit, after=args.after, min_rate=args.min_rate, period=args.period,
+    )
+    for row in rows:
+        salary = f"  [{row['salary']}]" if row["salary"] else ""
+        print(f"{row['date_posted']:%Y-%m-%d %H:%M}  {row['source'] or '':<10} {row['title']} — {row['company']}{salary}")
+        print(f"    {row['link']}")
+        if row.get("snippet"):
+            print(f"    {row['snippet']}")
+    if cursor:
+        print(f"\n[i] More results: --after '{cursor}'")
+
+
+def run_export(args):
+    pool = db.get_pg_pool()
+    db.ensure_schema(pool)
+    output = args.output if args.output == "-" else datetime.utcnow().strftime(args.output)
+    return export.export_jobs(pool, output, args.format, args.name, args.full, args.batch)
+
+
+def _mb(n):
+    return f"{n / 1024 / 1024:.1f} MB"
+
+
+def print_storage_report():
+    r = db.storage_report(db.get_pg_pool())
+    print(f"jobs table:            {_mb(r['jobs_bytes'])} ({r['jobs']} rows)")
+    print(f"descriptions table:    {_mb(r['descriptions_bytes'])} ({r['distinct_descriptions']} distinct)")
+    print(f"jobs by hash / inline: {r['jobs_with_hash']} / {r['jobs_inline']} ({_mb(r['inline_stored_bytes'])} inline)")
+    if r["distinct_descriptions"]:
+        print(f"one copy per job:      {_mb(r['referenced_raw_bytes'])} raw")
+        print(f"deduplicated:          {_mb(r['distinct_raw_bytes'])} raw, {_mb(r['distinct_stored_bytes'])} stored")
+        saved = 1 - r["distinct_stored_bytes"] / r["referenced_raw_bytes"] if r["referenced_raw_bytes"] else 0
+        print(f"description savings:   {saved:.0%} ({r['jobs_with_hash'] / r['distinct_descriptions']:.1f} jobs per description)")
+    if r["compression"]:
+        print("compression:           " + ", ".join(f"{method}={n}" for method, n in r["compression"].items()))
+    if r["cached_bytes"] is not None:
+        print("shared buffers:        " + ", ".join(f"{name}={_mb(n)}" for name, n in r["cached_bytes"].items()))
+    if r["orphan_descriptions"]:
+        print(f"orphaned descriptions: {r['orphan_descriptions']}")
+    if r["jobs_inline"] or r["orphan_descriptions"]:
+        print("[i] Run `python main.py migrate` to move inline descriptions and delete orphaned ones")
+
+
+def instrumented(args, fn, *fn_args):
+    """Run fn with the optional metrics endpoint, profiler and run-report outputs from args."""
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    profiler = profiling.ThreadProfiler() if args.profile else None
+    start = time.time()
+    if profiler:
+        profiler.start()
+    try:
+        return fn(*fn_args)
+    finally:
+        if profiler:
+            profiler.stop(args.profile)
+            print(f"[✓] Profile written to {args.profile}")
+        if args.metrics_file:
+            metrics.write_prometheus(args.metrics_file)
+        if args.report:
+            metrics.write_report(args.report, command=args.command, started=start, elapsed=time.time() - start)
+            print(f"[✓] Run report written to {args.report}")
+
+
+def add_instrumentation_args(parser):
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    parser.add_argument("--metrics-file", help="write Prometheus text-format metrics here on exit")
+    parser.add_argument("--report", help="write a JSON run report (counters, latency p50/p95) here")
+    parser.add_argument("--profile", help="write cProfile stats for the whole run, all threads, here")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Contract job scraper pipeline")
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run", help="run every scraper once (default)")
+    run.add_argument("--workers", type=int, default=None, help="sources to run concurrently")
+    add_instrumentation_args(run)
+
+    daemon = sub.add_parser("daemon", help="keep running, crawling each source on an adaptive schedule")
+    daemon.add_argument("--concurrency", type=int, default=None, help="sources crawling at once")
+    add_instrumentation_args(daemon)
+
+    sub.add_parser("migrate", help="apply the database schema, move inline descriptions, delete orphaned ones and exit")
+    dump = sub.add_parser("export", help="stream jobs new or changed since the last export to NDJSON, CSV or Parquet")
+    dump.add_argument("output", help='file to write, or "-" for stdout; strftime codes allowed, e.g. jobs-%%Y%%m%%d%%H%%M.ndjson')
+    dump.add_argument("--format", choices=sorted(export.WRITERS), help="default: from the file extension")
+    dump.add_argument("--name", default="default", help="watermark name; one per downstream consumer")
+    dump.add_argument("--full", action="store_true", help="ignore the watermark and export every row")
+    dump.add_argument("--batch", type=int, default=export.EXPORT_BATCH, help="rows per server-side cursor fetch")
+    add_instrumentation_args(dump)
+
+    sub.add_parser("storage", help="show description storage, deduplication and compression")
+
+    enqueue = sub.add_parser("enqueue", help="push a crawl for each source onto the Redis work queue")
+    enqueue.add_argument("--sources", nargs="*", help="limit to these sources (SOURCE names)")
+
+    worker = sub.add_parser("worker", help="consume listing/detail tasks from the Redis work queue")
+    worker.add_argument("--sources", nargs="*", help="limit to these sources (SOURCE names)")
+    worker.add_argument("--threads", type=int, default=1, help="worker loops in this process")
+    worker.add_argument("--idle-exit", action="store_true", help="exit once no task is ready")
+    add_instrumentation_args(worker)
+
+    enrich = sub.add_parser("enrich", help="fetch full descriptions for jobs written with DEFER_DETAILS=1")
+    enrich.add_argument("--sources", nargs="*", help="limit to these sources (SOURCE names)")
+    enrich.add_argument("--workers", type=int, default=None, help="detail fetches in flight")
+    enrich.add_argument("--idle-exit", action="store_true", help="exit once the backlog is empty")
+    enrich.add_argument("--status", action="store_true", help="show the backlog per source and exit")
+    add_instrumentation_args(enrich)
+
+    queue = sub.add_parser("queue", help="show work queue depth per source")
+    queue.add_argument("--requeue-dead", action="store_true", help="move dead-lettered tasks back onto the queue")
+
+    reparse = sub.add_parser("reparse", help="re-run the parsers over the raw page archive and upsert, offline")
+    reparse.add_argument("--sources", nargs="*", help="limit to these sources (SOURCE names)")
+    reparse.add_argument("--processes", type=int, default=None, help="parser processes (default: one per core)")
+    reparse.add_argument("--archive-dir", default=archive.ARCHIVE_DIR, help="archive to read")
+    add_instrumentation_args(reparse)
+
+    find = sub.add_parser("search", help="full-text search over stored jobs, newest first")
+    find.add_argument("query", nargs="?", help='websearch syntax, e.g. django -junior "outside ir35"')
+    find.add_argument("--source", help="limit to one SOURCE name")
+    find.add_argument("--since", help="posted on/after this ISO date")
+    find.add_argument("--until", help="posted before this ISO date")
+    find.add_argument("--min-rate", type=float, help="minimum top salary per --period")
+    find.add_argument("--period", default="day", choices=["hour", "day", "week", "month", "year"])
+    find.add_argument("--limit", type=int, default=20)
+    find.add_argument("--after", help="cursor printed with the previous page")
+
+    args = parser.parse_args()
+    if args.command is None:
+        args = parser.parse_args(["run"])
+    return args
 
 
 if __name__ == "__main__":
-    run_all()
\ No newline at end of file
+    args = parse_args()
+    try:
+        if args.command == "migrate":
+            db.migrate()
+        elif args.command == "export":
+            instrumented(args, run_export, args)
+        elif args.command == "storage":
+            print_storage_report()
+        elif args.command == "enqueue":
+            workqueue.enqueue_crawl(work_queue(), queue_scrapers(args.sources))
+        elif args.command == "worker":
+            instrumented(args, run_workers, args.sources, args.threads, args.idle_exit)
+        elif args.command == "enrich":
+            if args.status:
+                print_enrichment_backlog()
+            else:
+                instrumented(args, run_enricher, args.sources, args.workers, args.idle_exit)
+        elif args.command == "queue":
+            queue = work_queue()
+            if args.requeue_dead:
+                for source in queue_scrapers():
+                    print(f"[+] Requeued {queue.requeue_dead(source)} dead {source} tasks")
+            for source, depth in queue.stats(queue_scrapers()).items():
+                print(f"{source:<12} ready={depth['ready']} scheduled/in-flight={depth['scheduled_or_in_flight']} dead={depth['dead']}")
+        elif args.command == "daemon":
+            instrumented(args, run_daemon, args.concurrency)
+        elif args.command == "search":
+            print_search(args)
+        elif args.command == "reparse":
+            store = archive.PageArchive(args.archive_dir)
+            instrumented(args, archive.reparse, queue_scrapers(args.sources), store, args.processes)
+        else:
+            instrumented(args, run_all, args.workers)
+    finally:
+        sessions.close_all()
+        broker.close()
+        db.close_pools()
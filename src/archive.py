@@ -0,0 +1,181 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from . import db
+
+try:
+    import zstandard
+except ImportError:  # optional; pages are gzipped without it
+    zstandard = None
+
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+ARCHIVE_PAGES = os.getenv("ARCHIVE_PAGES", "1") != "0"
+ZSTD_LEVEL = int(os.getenv("ARCHIVE_ZSTD_LEVEL", 10))
+REPARSE_BATCH = int(os.getenv("REPARSE_BATCH", 64))  # listing pages parsed and upserted per batch
+
+
+class PageArchive:
+    """
+    Content-addressed on-disk store of raw fetched pages.
+
+    Each distinct body is compressed once (zstd if installed, else gzip) under
+    blobs/<aa>/<sha256>. Every fetch appends a line to index.ndjson with the
+    source, kind ("listing" or "detail"), URL, fetch time and content hash,
+    so refetching an unchanged page only costs an index line.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.ndjson")
+        self._lock = threading.Lock()
+
+    def _blob_path(self, digest, ext):
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.{ext}")
+
+    def put(self, source, kind, url, body):
+        """Store one fetched page; returns its content hash."""
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.has(digest):
+            if zstandard is not None:
+                ext, blob = "zst", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+            else:
+                ext, blob = "gz", gzip.compress(data)
+            path = self._blob_path(digest, ext)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write-then-rename so a concurrent reader never sees a partial blob
+            tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+        entry = {"source": source, "kind": kind, "url": url, "fetched_at": time.time(), "hash": digest}
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return digest
+
+    def has(self, digest):
+        return any(os.path.exists(self._blob_path(digest, ext)) for ext in ("zst", "gz"))
+
+    def get(self, digest):
+        """Return the decompressed page for a content hash."""
+        path = self._blob_path(digest, "zst")
+        if os.path.exists(path):
+            if zstandard is None:
+                raise RuntimeError(f"{path} is zstd-compressed; install zstandard to read it")
+            with open(path, "rb") as f:
+                return zstandard.ZstdDecompressor().decompress(f.read()).decode("utf-8")
+        with gzip.open(self._blob_path(digest, "gz"), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def entries(self):
+        """Yield index entries oldest first."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# -----------------------------------
+# Offline reparse
+# -----------------------------------
+def _parse_page(task):
+    ScraperClass, kind, root, digest = task
+    # parse()/parse_detail() only read their argument; skip __init__'s DB and broker setup
+    parser = ScraperClass.__new__(ScraperClass)
+    body = PageArchive(root).get(digest)
+    return parser.parse(body) if kind == "listing" else parser.parse_detail(body)
+
+
+def _reparse_batch(pool, scraper, store, digests, details):
+    """Parse one batch of listing pages, attach descriptions and upsert them."""
+    ScraperClass = type(scraper)
+    tasks = [(ScraperClass, "listing", store.root, digest) for digest in digests]
+    cards = [card for page in pool.map(_parse_page, tasks, chunksize=8) for card in page]
+    if not cards:
+        return 0, None
+    if scraper.HAS_DETAIL:
+        urls = sorted({card["url"] for card in cards if card.get("url") in details})
+        tasks = [(ScraperClass, "detail", store.root, details[url]) for url in urls]
+        parsed = dict(zip(urls, pool.map(_parse_page, tasks, chunksize=8)))
+        links = [card["url"] for card in cards if card.get("url")]
+        known = db.known_links(scraper.pg, links) if scraper.pg and links else set()
+        for card in cards:
+            if parsed.get(card.get("url")):
+                card["description"] = parsed[card["url"]]
+                card["detailed"] = True  # so write_jobs marks the link seen
+            elif card.get("url") in known:
+                card["description"] = None
+            elif scraper.DEFER_DETAILS:
+                card["needs_enrichment"] = True
+    return len(cards), scraper.write_jobs(cards)
+
+
+def reparse(scrapers, store=None, workers=None, batch=REPARSE_BATCH):
+    """
+    Re-run the current parsers over the archive and upsert the results.
+
+    Pages are parsed in a process pool (one process per core by default) and
+    no network calls are made. Each identical listing page is parsed once,
+    oldest first, so the newest copy of a job wins. Pages are handled in
+    batches of `batch`, each parsed, looked up and upserted before the next
+    is read, so memory stays bounded however large the archive is. Detail
+    sources take each card's description from the newest archived detail
+    page for its link; cards without one keep the stored description, or the
+    listing snippet if the job is not stored yet (flagged for the enrichment
+    worker with DEFER_DETAILS).
+
+    Args:
+        scrapers: scraper classes keyed by SOURCE
+        store: PageArchive to read (default ARCHIVE_DIR)
+        workers: parser processes (default os.cpu_count())
+        batch: listing pages per parse/upsert batch (default REPARSE_BATCH)
+
+    Returns:
+        dict of SOURCE -> {"parsed", "new", "changed", "unchanged", "failed"}
+    """
+    store = store or PageArchive()
+    listings = {source: {} for source in scrapers}  # source -> ordered set of hashes
+    details = {source: {} for source in scrapers}   # source -> url -> newest hash
+    for entry in store.entries():
+        if entry["source"] not in scrapers:
+            continue
+        if entry["kind"] == "listing":
+            listings[entry["source"]].pop(entry["hash"], None)
+            listings[entry["source"]][entry["hash"]] = True
+        elif entry["kind"] == "detail":
+            details[entry["source"]][entry["url"]] = entry["hash"]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for source, ScraperClass in scrapers.items():
+            digests = list(listings[source])
+            if not digests:
+                continue
+            scraper = ScraperClass()
+            totals = {"parsed": 0, "new": 0, "changed": 0, "unchanged": 0, "failed": 0}
+            for start in range(0, len(digests), max(batch, 1)):
+                parsed, counts = _reparse_batch(
+                    pool, scraper, store, digests[start:start + max(batch, 1)], details[source]
+                )
+                totals["parsed"] += parsed
+                for key, value in (counts or {}).items():
+                    totals[key] = totals.get(key, 0) + value
+            if not totals["parsed"]:
+                continue
+            results[source] = totals
+            print(
+                f"[✓] Reparsed {len(digests)} {source} pages into {totals['parsed']} records "
+                f"({totals['new']} new, {totals['changed']} changed, {totals['unchanged']} unchanged)"
+            )
+    return results
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:  # optional; without it broker POSTs run on a thread pool via requests
+    aiohttp = None
+
+DEFAULT_BROKER_URL = "http://localhost:8191/v1"
+BROKER_CONNECTIONS = int(os.getenv("BROKER_CONNECTIONS", 64))  # keep-alive connections per process
+BROKER_COOLDOWN = float(os.getenv("BROKER_COOLDOWN", 30))      # seconds an unreachable endpoint sits out
+
+HEADERS = {
+    "User-Agent": "BaseClient/1.0 (+https://your.project/)",
+    "Accept": "application/json, text/plain, */*",
+    "Content-Type": "application/json",
+}
+
+_lock = threading.Lock()
+_pools = {}
+_clients = {}  # event loop -> AsyncBrokerClient
+_loop = None
+
+
+class BrokerUnavailable(RuntimeError):
+    """The broker endpoint could not be reached at all (as opposed to a failed solve)."""
+
+
+def broker_urls(default=None):
+    """Broker endpoints from BROKER_URLS (comma-separated), else BROKER_URL."""
+    urls = [u.strip() for u in os.getenv("BROKER_URLS", "").split(",") if u.strip()]
+    return urls or [default or os.getenv("BROKER_URL", DEFAULT_BROKER_URL)]
+
+
+# -----------------------------------
+# Endpoint routing
+# -----------------------------------
+class Endpoint:
+    def __init__(self, url):
+        self.url = url
+        self.in_flight = 0
+        self.down_until = 0.0
+
+    @property
+    def healthy(self):
+        return time.monotonic() >= self.down_until
+
+
+class BrokerPool:
+    """
+    Least-loaded routing across FlareSolverr instances.
+
+    Each request goes to the healthy endpoint with the fewest requests in
+    flight, ties broken at random. An endpoint that refuses connections sits
+    out for BROKER_COOLDOWN seconds; if every endpoint is out, the least
+    loaded one is tried anyway.
+    """
+
+    def __init__(self, urls):
+        self.endpoints = [Endpoint(url) for url in urls]
+        self._lock = threading.Lock()
+
+    def _pick(self):
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.healthy] or self.endpoints
+            fewest = min(e.in_flight for e in candidates)
+            endpoint = random.choice([e for e in candidates if e.in_flight == fewest])
+            endpoint.in_flight += 1
+            return endpoint
+
+    def _done(self, endpoint, reachable):
+        with self._lock:
+            endpoint.in_flight -= 1
+            if reachable:
+                endpoint.down_until = 0.0
+            else:
+                endpoint.down_until = time.monotonic() + BROKER_COOLDOWN
+        if not reachable and len(self.endpoints) > 1:
+            print(f"[!] Broker {endpoint.url} unreachable; routing around it for {BROKER_COOLDOWN:.0f}s")
+
+    @asynccontextmanager
+    async def route(self):
+        """Reserve the least-loaded endpoint for the duration of the block."""
+        endpoint = self._pick()
+        reachable = True
+        try:
+            yield endpoint
+        except BrokerUnavailable:
+            reachable = False
+            raise
+        finally:
+            self._done(endpoint, reachable)
+
+
+def pool_for(urls):
+    """Return the process-wide router for a set of broker endpoints."""
+    key = tuple(urls)
+    with _lock:
+        if key not in _pools:
+            _pools[key] = BrokerPool(key)
+        return _pools[key]
+
+
+# -----------------------------------
+# Transport
+# -----------------------------------
+class AsyncBrokerClient:
+    """
+    Keep-alive HTTP client for broker POSTs, bound to one event loop.
+
+    Uses aiohttp when it is installed. Otherwise each POST runs on a thread
+    pool through a pooled requests.Session, which keeps connections open but
+    caps concurrency at BROKER_CONNECTIONS.
+    """
+
+    def __init__(self, connections=BROKER_CONNECTIONS):
+        self.connections = connections
+        self._session = None
+        self._http = None
+        self._executor = None
+
+    async def post(self, url, payload, timeout):
+        if aiohttp is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._threads(), self._post_sync, url, payload, timeout)
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.connections, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(headers=HEADERS, connector=connector)
+        try:
+            async with self._session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                resp.raise_for_status()
+                text = await resp.text()
+        except aiohttp.ClientConnectorError as e:
+            raise BrokerUnavailable(f"Broker request failed: {e}") from e
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RuntimeError(f"Broker request failed: {e!r}") from e
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+
+    def _threads(self):
+        if self._executor is None:
+            self._http = requests.Session()
+            self._http.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=self.connections)
+            self._http.mount("http://", adapter)
+            self._http.mount("https://", adapter)
+            self._executor = ThreadPoolExecutor(max_workers=self.connections, thread_name_prefix="broker")
+        return self._executor
+
+    def _post_sync(self, url, payload, timeout):
+        try:
+            resp = self._http.post(url, json=payload, timeout=timeout)
+            resp.raise_for_status()
+            try:
+                return resp.json()
+            except ValueError:
+                return resp.text
+        except requests.ConnectionError as e:
+            raise BrokerUnavailable(f"Broker request failed: {e}") from e
+        except requests.RequestException as e:
+            raise RuntimeError(f"Broker request failed: {e}") from e
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._http.close()
+            self._executor = None
+
+
+def client():
+    """The broker client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        if loop not in _clients:
+            _clients[loop] = AsyncBrokerClient()
+        return _clients[loop]
+
+
+# -----------------------------------
+# Shared event loop for blocking callers
+# -----------------------------------
+def event_loop():
+    """The process-wide loop that serves blocking _request calls, started on first use."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="broker-loop", daemon=True).start()
+        return _loop
+
+
+def run(coro):
+    """
+    Run a coroutine on the shared loop and block until it finishes.
+
+    Every scraper thread funnels its broker I/O through this one loop, so
+    in-flight requests are not limited by the number of threads. Must not be
+    called from a coroutine: async code awaits the coroutine directly.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, event_loop()).result()
+
+
+def close():
+    """Close the shared loop's client and stop the loop."""
+    global _loop
+    with _lock:
+        loop, _loop = _loop, None
+        shared = _clients.pop(loop, None) if loop else None
+        _pools.clear()
+    if loop is None:
+        return
+    if shared is not None:
+        asyncio.run_coroutine_threadsafe(shared.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,246 @@
+import hashlib
+import os
+import random
+import re
+import time
+
+from .seen import SEEN_TTL
+
+DEDUP = os.getenv("DEDUP", "1") != "0"
+# skip the detail fetch for a listing that matches another source's canonical job
+DEDUP_SKIP_DETAIL = os.getenv("DEDUP_SKIP_DETAIL", "0") != "0"
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", 0.6))  # estimated Jaccard to call two jobs the same
+# description words fingerprinted: listing snippets only carry roughly the first 25, and
+# comparing a snippet with a longer lead would halve its similarity to the full posting
+LEAD_WORDS = int(os.getenv("DEDUP_LEAD_WORDS", 25))
+# description words a job needs before it is matched at all: title and company alone
+# (e.g. LinkedIn cards, which have no snippet) are the same for different contracts
+MIN_WORDS = int(os.getenv("DEDUP_MIN_WORDS", 8))
+# links not listed for this long drop out of the index, like the seen cache; 0 keeps them
+DEDUP_TTL = int(os.getenv("DEDUP_TTL", SEEN_TTL))
+PRUNE_BATCH = 500  # expired links removed per assign() call
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard almost always share a bucket
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)  # fixed so signatures stay comparable across processes and runs
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_TOKEN = re.compile(r"[a-z0-9£$€]+")
+
+
+def shingles(job):
+    """Word 3-grams of title, company and the opening of the description."""
+    description = " ".join((job.get("description") or "").split()[:LEAD_WORDS])
+    text = f"{job.get('title') or ''} {job.get('company') or ''} {description}".lower()
+    tokens = _TOKEN.findall(text)
+    if len(tokens) < 3:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + 3]) for i in range(len(tokens) - 2)}
+
+
+def signature(job):
+    """MinHash signature (NUM_PERM ints), or None for a job with no text."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+        for s in shingles(job)
+    ]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def has_text(job):
+    """True when the job carries enough description to be compared with others."""
+    return len((job.get("description") or "").split()) >= MIN_WORDS
+
+
+def skips_detail(job, source):
+    """
+    True when `job` (listed by `source`) may keep its snippet instead of
+    fetching its detail page: DEDUP_SKIP_DETAIL is on, the job has real
+    description text and it matched a canonical job from another source.
+    """
+    return (
+        DEDUP_SKIP_DETAIL
+        and Deduper.is_duplicate(job)
+        and job.get("canonical_source") not in (None, source)
+        and has_text(job)
+    )
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_keys(sig):
+    return [
+        f"{i}:{hashlib.blake2b(repr(sig[i * ROWS:(i + 1) * ROWS]).encode(), digest_size=8).hexdigest()}"
+        for i in range(BANDS)
+    ]
+
+
+def _pack(sig):
+    return ",".join(f"{v:x}" for v in sig)
+
+
+def _unpack(raw):
+    return [int(v, 16) for v in raw.split(",")]
+
+
+class Deduper:
+    """
+    Cross-source near-duplicate detection with a MinHash/LSH index in Redis.
+
+    Every job link maps to a canonical link: the first posting of that
+    contract we saw. Only canonical jobs are indexed. A new link is compared
+    against the canonical jobs from other sources that share at least one
+    LSH band bucket with it, and joins the most similar one above
+    DEDUP_THRESHOLD; otherwise it becomes canonical itself. A link keeps its
+    canonical once assigned. Jobs with less than DEDUP_MIN_WORDS of
+    description are left unassigned until their full description is known,
+    and a canonical job indexed from its listing snippet is re-signed once
+    its detail page has been fetched.
+
+    Every assign() records when each link was last listed. Links not listed
+    for `ttl` seconds are pruned from every key on later calls, so the index
+    only holds postings that are still around.
+    """
+
+    def __init__(self, redis_client, prefix="jobs:dedup", threshold=DEDUP_THRESHOLD, ttl=DEDUP_TTL):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.threshold = threshold
+        self.ttl = ttl
+        self.canonical_key = f"{prefix}:canonical"  # link -> canonical link
+        self.sig_key = f"{prefix}:sig"              # canonical link -> packed signature
+        self.source_key = f"{prefix}:source"        # canonical link -> source that listed it
+        self.touched_key = f"{prefix}:touched"      # link -> when it was last listed
+
+    def _band_key(self, band):
+        return f"{self.prefix}:band:{band}"
+
+    def assign(self, jobs, source=None):
+        """
+        Set job["canonical"] (and job["canonical_source"]) on every job with
+        a URL and enough description; returns the jobs.
+
+        Jobs in the same batch all come from `source`, so they are never
+        matched against each other. Canonical jobs arriving with their detail
+        description (job["detailed"]) are re-signed. Redis failures leave
+        jobs without a canonical.
+        """
+        targets = [job for job in jobs if job.get("url")]
+        if not targets:
+            return jobs
+        try:
+            resign = [job for job in targets if job.get("detailed") and job.get("canonical") == job["url"]]
+            fresh = [job for job in targets if not job.get("canonical")]
+            if fresh:
+                self._assign(fresh, source)
+            if resign:
+                self._resign(resign)
+            self._touch([job["url"] for job in targets])
+        except Exception as e:
+            print(f"[!] Duplicate lookup failed: {e}")
+        return jobs
+
+    def _assign(self, jobs, source):
+        stored = self.redis.hmget(self.canonical_key, [job["url"] for job in jobs])
+        fresh, known = [], []
+        for job, canonical in zip(jobs, stored):
+            if canonical:
+                job["canonical"] = canonical
+                known.append(job)
+            elif has_text(job):
+                fresh.append((job, signature(job)))
+        if known:
+            owners = self.redis.hmget(self.source_key, [job["canonical"] for job in known])
+            for job, owner in zip(known, owners):
+                job["canonical_source"] = owner
+        if not fresh:
+            return
+
+        # candidate canonical links sharing any band bucket, one round trip
+        pipe = self.redis.pipeline(transaction=False)
+        for _, sig in fresh:
+            for band in band_keys(sig) if sig else []:
+                pipe.smembers(self._band_key(band))
+        buckets = iter(pipe.execute())
+        candidates = [set().union(*(next(buckets) for _ in range(BANDS))) if sig else set() for _, sig in fresh]
+        wanted = sorted(set().union(*candidates))
+        sigs = dict(zip(wanted, self.redis.hmget(self.sig_key, wanted))) if wanted else {}
+        sigs = {link: _unpack(raw) for link, raw in sigs.items() if raw}
+        owners = dict(zip(wanted, self.redis.hmget(self.source_key, wanted))) if wanted else {}
+        if source:
+            # the same source listing a contract twice is two postings, not a duplicate
+            sigs = {link: sig for link, sig in sigs.items() if owners.get(link) != source}
+
+        new_canonicals = []
+        for (job, sig), linked in zip(fresh, candidates):
+            canonical = None
+            if sig:
+                scored = [(similarity(sig, sigs[link]), link) for link in linked if link in sigs]
+                best = max(scored, default=(0.0, None))
+                if best[0] >= self.threshold:
+                    canonical = best[1]
+                else:
+                    new_canonicals.append((job["url"], sig, band_keys(sig)))
+            job["canonical"] = canonical or job["url"]
+            job["canonical_source"] = owners.get(canonical) if canonical else source
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(self.canonical_key, mapping={job["url"]: job["canonical"] for job, _ in fresh})
+        for link, sig, keys in new_canonicals:
+            pipe.hset(self.sig_key, link, _pack(sig))
+            if source:
+                pipe.hset(self.source_key, link, source)
+            for key in keys:
+                pipe.sadd(self._band_key(key), link)
+        pipe.execute()
+
+    def _resign(self, jobs):
+        """Re-index canonical jobs whose signature changed now their full description is known."""
+        stored = self.redis.hmget(self.sig_key, [job["url"] for job in jobs])
+        pipe = self.redis.pipeline(transaction=False)
+        for job, raw in zip(jobs, stored):
+            sig = signature(job) if raw and has_text(job) else None  # no raw: not indexed (pruned)
+            old = _unpack(raw) if sig else None
+            if sig is None or sig == old:
+                continue
+            old_keys, new_keys = set(band_keys(old)), set(band_keys(sig))
+            for key in old_keys - new_keys:
+                pipe.srem(self._band_key(key), job["url"])
+            for key in new_keys - old_keys:
+                pipe.sadd(self._band_key(key), job["url"])
+            pipe.hset(self.sig_key, job["url"], _pack(sig))
+        pipe.execute()
+
+    def _touch(self, links):
+        """Record links as listed now and prune a batch of links not listed within the TTL."""
+        if not self.ttl:
+            return
+        now = time.time()
+        self.redis.zadd(self.touched_key, {link: now for link in links})
+        expired = self.redis.zrangebyscore(self.touched_key, 0, now - self.ttl, start=0, num=PRUNE_BATCH)
+        if expired:
+            self._forget(expired)
+
+    def _forget(self, links):
+        """Drop links from the canonical map, the signatures and their band buckets."""
+        sigs = self.redis.hmget(self.sig_key, links)
+        pipe = self.redis.pipeline(transaction=False)
+        for link, raw in zip(links, sigs):
+            for key in band_keys(_unpack(raw)) if raw else []:
+                pipe.srem(self._band_key(key), link)
+        for key in (self.canonical_key, self.sig_key, self.source_key):
+            pipe.hdel(key, *links)
+        pipe.zrem(self.touched_key, *links)
+        pipe.execute()
+
+    @staticmethod
+    def is_duplicate(job):
+        """True when the job was matched to another link's canonical posting."""
+        return bool(job.get("canonical")) and job["canonical"] != job.get("url")
@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+DIRECT_TIMEOUT = float(os.getenv("DIRECT_TIMEOUT", 15))
+# how long a host that blocked a direct request is sent straight to the broker
+BROKER_MEMORY = int(os.getenv("DIRECT_BROKER_MEMORY", 3600))
+
+BLOCK_STATUSES = {403, 429, 503}
+BLOCK_MARKERS = (
+    "just a moment...",
+    "cf-chl",
+    "/cdn-cgi/challenge-platform",
+    "attention required! | cloudflare",
+    "captcha",
+    "authwall",
+)
+
+_lock = threading.Lock()
+_needs_broker = {}  # host -> time the last direct attempt was blocked
+
+
+def init_session():
+    """Keep-alive session for plain HTTP fetches with browser-like headers."""
+    s = requests.Session()
+    s.headers.update({
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+        ),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-GB,en;q=0.9",
+    })
+    return s
+
+
+def needs_broker(host):
+    with _lock:
+        blocked_at = _needs_broker.get(host)
+    return blocked_at is not None and time.time() - blocked_at < BROKER_MEMORY
+
+
+def remember_broker(host):
+    with _lock:
+        _needs_broker[host] = time.time()
+
+
+def is_blocked(resp):
+    """True when a response looks like a challenge or block page."""
+    if resp.status_code in BLOCK_STATUSES:
+        return True
+    head = resp.text[:20000].lower()
+    return any(marker in head for marker in BLOCK_MARKERS)
+
+
+def fetch(session, cmd, url, postData=None, timeout=DIRECT_TIMEOUT):
+    """
+    Fetch a URL without the broker.
+
+    Returns:
+        A dict shaped like a FlareSolverr response (so callers can keep reading
+        result["solution"]["response"]), or None when the request failed, was
+        blocked or hit a server error (5xx) and the broker should be used
+        instead. Only 2xx responses are "ok"; any other status (404, 410, ...)
+        is an "error" result without a body, so an error page is never parsed
+        as a listing. Blocked hosts are remembered so later calls skip the
+        direct attempt (see needs_broker).
+    """
+    try:
+        if cmd == "request.post":
+            resp = session.post(
+                url,
+                data=postData,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=timeout,
+            )
+        else:
+            resp = session.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"[!] Direct fetch failed for {url}: {e}")
+        return None
+    if is_blocked(resp):
+        host = urlparse(url).netloc
+        print(f"[i] {host} blocked a direct request (HTTP {resp.status_code}); using the broker")
+        remember_broker(host)
+        return None
+    if resp.status_code >= 500:
+        print(f"[!] Direct fetch got HTTP {resp.status_code} for {url}; retrying through the broker")
+        return None
+    if not 200 <= resp.status_code < 300:
+        return {"status": "error", "direct": True, "message": f"HTTP {resp.status_code} for {url}"}
+    return {
+        "status": "ok",
+        "direct": True,
+        "solution": {"url": resp.url, "status": resp.status_code, "response": resp.text},
+    }
@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from . import db, metrics
+
+ENRICH_WORKERS = int(os.getenv("ENRICH_WORKERS", 8))                   # detail fetches in flight, all hosts
+ENRICH_HOST_CONCURRENCY = int(os.getenv("ENRICH_HOST_CONCURRENCY", 2))  # ... and per host
+ENRICH_BATCH = int(os.getenv("ENRICH_BATCH", 50))                      # jobs claimed per DB round trip
+ENRICH_RETRY_BASE = float(os.getenv("ENRICH_RETRY_BASE", 300))         # seconds a claim stays hidden, doubled per attempt
+ENRICH_MAX_ATTEMPTS = int(os.getenv("ENRICH_MAX_ATTEMPTS", 5))
+ENRICH_POLL_INTERVAL = float(os.getenv("ENRICH_POLL_INTERVAL", 5.0))
+
+
+class Enricher:
+    """
+    Fill in full descriptions for jobs written with DEFER_DETAILS.
+
+    Jobs flagged needs_enrichment are claimed from the jobs table newest
+    first (see db.claim_enrichment), so the freshest listings get their
+    description first and any number of enrichers can share the backlog.
+    Claimed jobs are dispatched in priority order to a pool of `workers`
+    threads, skipping past a job whose host already has `host_concurrency`
+    fetches running so one slow site cannot occupy every worker. The
+    per-host token bucket in _request still sets the request rate.
+
+    A job whose detail fetch returns nothing is left flagged; its claim
+    expires with backoff and it is retried until ENRICH_MAX_ATTEMPTS.
+
+    Args:
+        scrapers: scraper classes keyed by SOURCE; sources without a detail
+                  stage are ignored
+    """
+
+    def __init__(self, scrapers, workers=ENRICH_WORKERS, host_concurrency=ENRICH_HOST_CONCURRENCY, batch=ENRICH_BATCH):
+        self.classes = {source: cls for source, cls in scrapers.items() if cls.HAS_DETAIL}
+        self.workers = workers
+        self.host_concurrency = host_concurrency
+        self.batch = batch
+        self.pg = db.get_pg_pool()
+        self._scrapers = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def scraper(self, source):
+        with self._lock:
+            if source not in self._scrapers:
+                self._scrapers[source] = self.classes[source]()
+            return self._scrapers[source]
+
+    def claim(self):
+        try:
+            return db.claim_enrichment(self.pg, self.classes, self.batch, ENRICH_RETRY_BASE, ENRICH_MAX_ATTEMPTS)
+        except Exception as e:
+            print(f"[!] Enrichment claim failed: {e}")
+            return []
+
+    def fetch(self, job):
+        scraper = self.scraper(job["source"])
+        scraper.enrich(job)
+        job["needs_enrichment"] = not job["detailed"]
+        metrics.inc("enriched_jobs_total", source=job["source"], outcome="ok" if job["detailed"] else "failed")
+        return job
+
+    def flush(self, done):
+        """Upsert enriched jobs, one write_jobs call per source."""
+        by_source = {}
+        for job in done:
+            if job["detailed"]:
+                by_source.setdefault(job["source"], []).append(job)
+        for source, jobs in by_source.items():
+            counts = self.scraper(source).write_jobs(jobs)
+            print(f"[✓] Enriched {len(jobs)} {source} jobs ({counts['failed']} failed to write)")
+        done.clear()
+
+    def run(self, idle_exit=False):
+        """Enrich until stop() is called (or, with idle_exit, until the backlog is empty)."""
+        if not self.pg or not self.classes:
+            print("[!] Nothing to enrich: no database or no detail sources")
+            return
+        pending, running, done = [], {}, []  # running: future -> host
+        busy = Counter()
+        print(f"🧩 Enricher started: {self.workers} workers, {self.host_concurrency} per host")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while not self._stop.is_set() or running:
+                if self._stop.is_set():
+                    pending.clear()  # unclaimed once their claim expires
+                elif len(pending) < self.workers:
+                    claimed = self.claim()
+                    if claimed:
+                        pending = sorted(pending + claimed, key=lambda j: (j["date_posted"], j["id"]), reverse=True)
+
+                # newest first, skipping jobs whose host is at its limit
+                for job in list(pending):
+                    if len(running) >= self.workers:
+                        break
+                    host = urlparse(job["url"]).netloc
+                    if busy[host] >= self.host_concurrency:
+                        continue
+                    pending.remove(job)
+                    busy[host] += 1
+                    running[pool.submit(self.fetch, job)] = host
+
+                if not running:
+                    self.flush(done)
+                    if idle_exit or self._stop.is_set():
+                        break
+                    self._stop.wait(ENRICH_POLL_INTERVAL)
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    busy[running.pop(future)] -= 1
+                    done.append(future.result())
+                if len(done) >= self.batch:
+                    self.flush(done)
+        self.flush(done)
+        print("[✓] Enricher stopped")
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,189 @@
+import csv
+import json
+import os
+import sys
+import uuid
+from decimal import Decimal
+
+from . import db
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional; only needed for --format parquet
+    pyarrow = None
+
+EXPORT_BATCH = int(os.getenv("EXPORT_BATCH", 2000))  # rows per server-side cursor fetch
+# rows updated in the last few seconds are left for the next export, so a
+# batch still committing with an older NOW() cannot slip behind the watermark
+EXPORT_LAG = float(os.getenv("EXPORT_LAG", 60))
+
+COLUMNS = (
+    "id", "source", "company", "title", "description", "link", "location", "salary", "salary_min",
+    "salary_max", "salary_period", "date_posted", "canonical_link", "needs_enrichment", "created_at", "updated_at",
+)
+
+_EXPORT_SQL = f"""
+    SELECT id, source, company, title, {db.DESCRIPTION_SQL}, link, location, salary, salary_min,
+           salary_max, salary_period, date_posted, canonical_link, needs_enrichment, created_at, updated_at
+    FROM jobs
+    WHERE (updated_at, id) > (%s, %s) AND updated_at < NOW() - make_interval(secs => %s)
+    ORDER BY updated_at, id
+"""
+
+
+# -----------------------------------
+# Watermarks
+# -----------------------------------
+def get_watermark(pool, name):
+    """(updated_at, id) of the last row the named export emitted, or None."""
+    with db.pg_connection(pool) as conn, conn.cursor() as cur:
+        cur.execute("SELECT updated_at, last_id FROM export_watermarks WHERE name = %s", (name,))
+        return cur.fetchone()
+
+
+def set_watermark(pool, name, updated_at, last_id):
+    with db.pg_connection(pool) as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO export_watermarks (name, updated_at, last_id) VALUES (%s, %s, %s)
+            ON CONFLICT (name) DO UPDATE
+            SET updated_at = EXCLUDED.updated_at, last_id = EXCLUDED.last_id, exported_at = NOW()
+            """,
+            (name, updated_at, last_id),
+        )
+
+
+# -----------------------------------
+# Writers
+# -----------------------------------
+def _plain(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+class NdjsonWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, rows):
+        self.f.writelines(json.dumps({k: _plain(v) for k, v in zip(COLUMNS, row)}, ensure_ascii=False) + "\n" for row in rows)
+
+    def close(self):
+        pass
+
+
+class CsvWriter:
+    def __init__(self, f):
+        self.writer = csv.writer(f)
+        self.writer.writerow(COLUMNS)
+
+    def write(self, rows):
+        self.writer.writerows([_plain(v) for v in row] for row in rows)
+
+    def close(self):
+        pass
+
+
+class ParquetWriter:
+    """One row group per fetched batch, so memory stays at one batch."""
+
+    def __init__(self, f):
+        if pyarrow is None:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.schema = pyarrow.schema([
+            ("id", pyarrow.int64()), ("source", pyarrow.string()), ("company", pyarrow.string()),
+            ("title", pyarrow.string()), ("description", pyarrow.string()), ("link", pyarrow.string()),
+            ("location", pyarrow.string()), ("salary", pyarrow.string()), ("salary_min", pyarrow.float64()),
+            ("salary_max", pyarrow.float64()), ("salary_period", pyarrow.string()),
+            ("date_posted", pyarrow.timestamp("us")), ("canonical_link", pyarrow.string()),
+            ("needs_enrichment", pyarrow.bool_()), ("created_at", pyarrow.timestamp("us")),
+            ("updated_at", pyarrow.timestamp("us")),
+        ])
+        self.writer = pyarrow.parquet.ParquetWriter(f, self.schema, compression="zstd")
+
+    def write(self, rows):
+        arrays = [
+            pyarrow.array([float(v) if isinstance(v, Decimal) else v for v in values], type=field.type)
+            for field, values in zip(self.schema, zip(*rows))
+        ]
+        self.writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"ndjson": (NdjsonWriter, "w"), "csv": (CsvWriter, "w"), "parquet": (ParquetWriter, "wb")}
+
+
+def format_for(path):
+    """Export format implied by a file name, defaulting to NDJSON."""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return {"jsonl": "ndjson", "ndjson": "ndjson", "csv": "csv", "parquet": "parquet"}.get(ext, "ndjson")
+
+
+# -----------------------------------
+# Export
+# -----------------------------------
+def export_jobs(pool, path, fmt=None, name="default", full=False, batch_size=EXPORT_BATCH):
+    """
+    Stream jobs new or changed since the last export to a file.
+
+    Rows are read in (updated_at, id) order through a named (server-side)
+    cursor and written one batch at a time, so memory use does not depend
+    on the table size. The file is written under a temporary name and
+    renamed when complete; only then does the named watermark advance to
+    the last row written. An interrupted export therefore leaves no partial
+    file, and the next run starts again from the previous watermark.
+
+    Args:
+        pool: PostgreSQL pool from db.get_pg_pool
+        path: output file, or "-" for stdout (NDJSON/CSV only)
+        fmt: "ndjson", "csv" or "parquet" (default: from the file extension)
+        name: watermark name; give each downstream consumer its own
+        full: ignore the watermark and export every row
+
+    Returns:
+        number of rows written.
+    """
+    fmt = fmt or format_for(path)
+    Writer, mode = WRITERS[fmt]
+    if path == "-" and fmt == "parquet":
+        raise ValueError("Parquet export needs a file path")
+    watermark = None if full else get_watermark(pool, name)
+    after = watermark or ("-infinity", 0)
+
+    tmp = None if path == "-" else f"{path}.{uuid.uuid4().hex}.tmp"
+    f = sys.stdout if path == "-" else open(tmp, mode, **({} if "b" in mode else {"newline": "", "encoding": "utf-8"}))
+    written, last = 0, None
+    try:
+        writer = Writer(f)
+        with db.pg_connection(pool) as conn, conn.cursor(name=f"export_{uuid.uuid4().hex}") as cur:
+            cur.itersize = batch_size
+            cur.execute(_EXPORT_SQL, (after[0], after[1], EXPORT_LAG))
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                writer.write(rows)
+                written += len(rows)
+                last = rows[-1]
+        writer.close()
+    except BaseException:
+        if tmp:
+            f.close()
+            os.remove(tmp)
+        raise
+    if tmp:
+        f.close()
+        os.replace(tmp, path)
+    else:
+        f.flush()
+
+    if last is not None:
+        set_watermark(pool, name, last[COLUMNS.index("updated_at")], last[0])
+    print(f"[✓] Exported {written} jobs to {path} ({fmt})", file=sys.stderr if path == "-" else sys.stdout)
+    return written
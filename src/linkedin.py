@@ -1,26 +1,29 @@
 from .base import BaseClient
-from bs4 import BeautifulSoup
-from datetime import datetime
+from .parsing import parse_html
 from urllib.parse import urlencode
 import html
-import time
 
 
 class LinkedInScraper(BaseClient):
+    SOURCE = "LinkedIn"
+    HAS_DETAIL = True
     BASE_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+    FETCH_STRATEGY = "direct"
 
-    def __init__(self, keyword="Django", location="London", pages=1, sortby="DD"):
+    def __init__(self, keyword="Django", location="London", pages=1, sortby="DD", mode=None):
         """
         sortby:
           - 'DD' = Date Descending (Newest)
           - 'DA' = Date Ascending (Oldest)
           - 'R'  = Relevance
+        mode: "incremental", "full" or "backfill" (defaults to CRAWL_MODE)
         """
         super().__init__()
         self.keyword = keyword
         self.location = location
         self.pages = pages
         self.sortby = sortby
+        self.crawl_mode = mode or self.crawl_mode
 
     def fetch_page(self, index=0):
         """Fetch a batch of job listings from LinkedIn's guest jobs API."""
@@ -32,70 +35,39 @@ class LinkedInScraper(BaseClient):
         }
 
         url = f"{self.BASE_URL}?{urlencode(query)}"
-        result = self._request("request.get", url, maxTimeout=60000)
+        result = self._request("request.get", url, maxTimeout=60000, hedge=True, kind="listing")
         html_text = result.get("solution", {}).get("response", "") if isinstance(result, dict) else result
         return html_text or ""
 
-    def fetch_detail(self, url):
-        """Fetch full job description from the LinkedIn job page."""
-        try:
-            result = self._request("request.get", url, maxTimeout=60000)
-            html_text = result.get("solution", {}).get("response", "") if isinstance(result, dict) else result
-            soup = BeautifulSoup(html.unescape(html_text), "html.parser")
-            desc_el = soup.select_one(".show-more-less-html__markup")
-            return desc_el.get_text(" ", strip=True) if desc_el else ""
-        except Exception as e:
-            print(f"[!] Failed to fetch detail for {url}: {e}")
-            return ""
+    def fetch_listing(self, page):
+        return self.fetch_page(page * 25)  # LinkedIn loads 25 per batch
 
-    def parse(self, raw_html):
-        soup = BeautifulSoup(raw_html, "html.parser")
-        jobs = []
+    def iter_pages(self):
+        for page in range(self.page_limit(self.pages)):
+            yield self.fetch_listing(page)
 
-        for card in soup.select("li"):
-            title_el = card.select_one("h3.base-search-card__title")
-            company_el = card.select_one("h4.base-search-card__subtitle a")
-            location_el = card.select_one("span.job-search-card__location")
-            posted_el = card.select_one("time")
-            link_el = card.select_one("a.base-card__full-link")
+    def parse_detail(self, html_text):
+        """Full job description from the LinkedIn job page."""
+        return parse_html(html.unescape(html_text)).text_of(".show-more-less-html__markup", " ")
 
-            title = title_el.get_text(strip=True) if title_el else ""
-            company = company_el.get_text(strip=True) if company_el else ""
-            location = location_el.get_text(strip=True) if location_el else ""
-            posted = posted_el.get("datetime", "") if posted_el else ""
-            link = link_el.get("href") if link_el else ""
+    def parse(self, raw_html):
+        root = parse_html(raw_html, only=("li",))
+        jobs = []
 
-            # optional full description fetch
-            full_desc = self.fetch_detail(link) if link else ""
+        for card in root.select("li"):
+            title = card.text_of("h3.base-search-card__title")
+            company = card.text_of("h4.base-search-card__subtitle a")
+            location = card.text_of("span.job-search-card__location")
+            posted = card.attr_of("time", "datetime")
+            link = card.attr_of("a.base-card__full-link", "href")
 
             jobs.append({
                 "company": company,
                 "title": title,
                 "location": location,
-                "description": full_desc,
+                "description": "",
                 "url": link,
                 "posted": posted,
             })
 
-            time.sleep(0.5)
-
         return jobs
-
-    def run(self):
-        total_jobs = 0
-        for page in range(self.pages):
-            index = page * 25  # LinkedIn loads 25 per batch
-            html_text = self.fetch_page(index)
-            jobs = self.parse(html_text)
-            total_jobs += len(jobs)
-
-            for job in jobs:
-                self.insert_job(
-                    company=job["company"],
-                    title=job["title"],
-                    description=job["description"],
-                    link=job["url"],
-                    date_posted=datetime.utcnow(),
-                )
-
-        print(f"[✓] Inserted {total_jobs} LinkedIn records")
\ No newline at end of file
@@ -0,0 +1,185 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# seconds; covers parser calls (ms) up to full broker timeouts (70 s)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> value
+_histograms = {}  # (name, labels) -> Histogram
+_help = {}
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Upper bucket bound containing the q-th observation (approximate)."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def describe(name, text):
+    _help[name] = text
+
+
+def inc(name, value=1, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    key = _key(name, labels)
+    with _lock:
+        if key not in _histograms:
+            _histograms[key] = Histogram()
+        _histograms[key].observe(value)
+
+
+@contextmanager
+def timed(name, **labels):
+    """Record the duration of the block in histogram `name`, and count errors raised from it."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        inc(f"{name.removesuffix('_seconds')}_errors_total", **labels)
+        raise
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+# -----------------------------------
+# Exporters
+# -----------------------------------
+def _fmt_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in pairs) + "}"
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted(_histograms.items(), key=lambda kv: kv[0])
+        described = set()
+        for (name, labels), value in counters:
+            if name not in described:
+                if name in _help:
+                    lines.append(f"# HELP {name} {_help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                described.add(name)
+            lines.append(f"{name}{_fmt_labels(labels)} {value}")
+        for (name, labels), hist in histograms:
+            if name not in described:
+                if name in _help:
+                    lines.append(f"# HELP {name} {_help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                described.add(name)
+            cumulative = 0
+            for bound, n in zip(BUCKETS + ("+Inf",), hist.counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {hist.sum}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {hist.count}")
+    return "\n".join(lines) + "\n"
+
+
+def report():
+    """Structured run report: counters plus count/sum/p50/p95 per histogram."""
+    with _lock:
+        return {
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(_counters.items())
+            ],
+            "histograms": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": hist.count,
+                    "sum": hist.sum,
+                    "p50": hist.quantile(0.5),
+                    "p95": hist.quantile(0.95),
+                }
+                for (name, labels), hist in sorted(_histograms.items(), key=lambda kv: kv[0])
+            ],
+        }
+
+
+def write_prometheus(path):
+    with open(path, "w") as f:
+        f.write(render_prometheus())
+
+
+def write_report(path, **extra):
+    with open(path, "w") as f:
+        json.dump({**extra, **report()}, f, indent=2, default=str)
+
+
+def serve(port, host="0.0.0.0"):
+    """Expose /metrics on a background thread; returns the server."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[✓] Serving metrics on http://{host}:{port}/metrics")
+    return server
+
+
+describe("request_seconds", "Latency of fetches through _request, by source and fetch path")
+describe("requests_total", "Fetches through _request, by source, fetch path and outcome")
+describe("response_bytes_total", "Bytes of page content returned by _request")
+describe("rate_limit_wait_seconds", "Time spent waiting on the per-host token bucket")
+describe("parse_seconds", "Time spent parsing one listing page")
+describe("detail_fetch_seconds", "Time spent fetching and parsing one detail page")
+describe("db_upsert_seconds", "Time spent upserting one batch")
+describe("jobs_total", "Jobs written, by source and outcome (new/changed/unchanged/failed)")
+describe("request_retries_total", "Broker calls retried after a transient failure, by source and host")
+describe("circuit_opened_total", "Times a host's circuit breaker opened")
+describe("hedged_requests_total", "Listing fetches that raced a duplicate broker call")
+describe("duplicate_details_skipped_total", "Detail fetches skipped because the listing matched another source's canonical job")
+describe("scheduled_runs_total", "Daemon crawls, by source and outcome")
+describe("scheduled_new_jobs_total", "New jobs found by daemon crawls, by source")
+describe("enriched_jobs_total", "Deferred detail fetches by the enrichment worker, by source and outcome")
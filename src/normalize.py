@@ -0,0 +1,154 @@
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+_RELATIVE = re.compile(r"\b(\d+|an?|one)\+?\s*(minute|min|hour|hr|day|week|month|year)s?\s+ago")
+_UNITS = {
+    "minute": timedelta(minutes=1),
+    "min": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "hr": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+_NOW_WORDS = ("just posted", "just now", "today", "new", "moments ago", "active today")
+_ABSOLUTE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%d %B %Y",
+    "%d %b %Y",
+)
+
+_NUMBER = r"([£$€])?\s*(\d[\d,]*(?:\.\d+)?)\s*(k\b)?"
+_AMOUNT = re.compile(_NUMBER, re.IGNORECASE)
+_RANGE = re.compile(rf"{_NUMBER}\s*(?:-|–|—|to)\s*{_NUMBER}", re.IGNORECASE)
+_IR35 = re.compile(r"\bir\s*-?\s*35\b", re.IGNORECASE)
+_PERIODS = (
+    ("hour", re.compile(r"per hour|an hour|a hour|hourly|/\s*hr|/\s*hour|\bp/?h\b", re.IGNORECASE)),
+    ("day", re.compile(r"per day|a day|daily|/\s*day|\bp/?d\b", re.IGNORECASE)),
+    # not "a week" / "a month": "4 days a week" or "6 month contract" say nothing about the rate
+    ("week", re.compile(r"per week|weekly|/\s*week|\bp/?w\b", re.IGNORECASE)),
+    ("year", re.compile(r"per annum|per year|a year|annual|/\s*year|\bp\.?a\.?\b", re.IGNORECASE)),
+    ("month", re.compile(r"per month|/\s*month|\bpcm\b", re.IGNORECASE)),
+)
+
+
+@lru_cache(maxsize=4096)
+def _posted(text):
+    """Parse one posted string into ("abs", datetime) or ("rel", timedelta, floor_to_day); cached per string."""
+    text = " ".join(text.lower().split()).removeprefix("posted ")
+    if not text:
+        return None
+    if text == "yesterday":
+        return ("rel", timedelta(days=1), True)
+    if text in _NOW_WORDS:
+        return ("rel", timedelta(0), True)
+    match = _RELATIVE.search(text)
+    if match:
+        count, unit = match.groups()
+        count = 1 if count in ("a", "an", "one") else int(count)
+        return ("rel", count * _UNITS[unit], _UNITS[unit] >= timedelta(days=1))
+    for fmt in _ABSOLUTE_FORMATS:
+        try:
+            return ("abs", datetime.strptime(text, fmt))
+        except ValueError:
+            pass
+    try:
+        posted = datetime.fromisoformat(text.upper())  # text was lowercased; "z" is not accepted
+    except ValueError:
+        return None
+    if posted.tzinfo is not None:
+        posted = posted.astimezone(timezone.utc).replace(tzinfo=None)
+    return ("abs", posted)
+
+
+def parse_posted(text, now):
+    """
+    Turn a listing's posted value into a naive UTC datetime, or None.
+
+    Understands ISO dates ("2026-10-17"; an offset is converted to UTC), UK
+    dates ("17/10/2026 09:12") and relative strings ("3 days ago", "Posted
+    30+ days ago", "Yesterday", "Just posted"). Day-granular relative values are floored to midnight so
+    re-scraping the same listing later in the day gives the same timestamp.
+    """
+    parsed = _posted(text) if text else None
+    if parsed is None:
+        return None
+    if parsed[0] == "abs":
+        return parsed[1]
+    _, delta, floor = parsed
+    posted = now - delta
+    return posted.replace(hour=0, minute=0, second=0, microsecond=0) if floor else posted
+
+
+def _range(text):
+    """
+    [low, high] of the first "X - Y" range in the text, or None.
+
+    The upper bound may be a bare number ("£500 - 600"), and a "k" on
+    either end applies to both ("£60 - 70k"). With a currency symbol in
+    the text, only a range carrying one counts.
+    """
+    priced = any(symbol in text for symbol in "£$€")
+    for match in _RANGE.finditer(text):
+        cur_a, num_a, k_a, cur_b, num_b, k_b = match.groups()
+        if priced and not (cur_a or cur_b):
+            continue
+        low, high = float(num_a.replace(",", "")), float(num_b.replace(",", ""))
+        if k_a or k_b:
+            low, high = (v * 1000 if v < 1000 else v for v in (low, high))
+        return [low, high]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def parse_salary(text):
+    """
+    Parse a salary string into (min, max, period), each possibly None.
+
+    "£500 - £600 per day" -> (500.0, 600.0, "day"); "£500 - 600 per day"
+    -> (500.0, 600.0, "day"); "£60k - 70k" and "£60 - 70k" -> (60000.0,
+    70000.0, "year"); "£60k" -> (60000.0, 60000.0, "year"); "£1.5k per
+    week" -> (1500.0, 1500.0, "week"). Periods are "hour", "day", "week",
+    "month" or "year". Without an explicit period it is guessed from the
+    amount: under 200 is hourly, under 5,000 a day rate, otherwise yearly.
+    """
+    if not text:
+        return None, None, None
+    text = _IR35.sub(" ", text)
+    amounts = _range(text)
+    if amounts is None:
+        found = _AMOUNT.findall(text)
+        # with a currency symbol anywhere, ignore bare numbers like the 6 in "6 month contract"
+        if any(currency for currency, _, _ in found):
+            found = [match for match in found if match[0]]
+        amounts = [float(number.replace(",", "")) * (1000 if thousands else 1) for _, number, thousands in found]
+    if not amounts:
+        return None, None, None
+    low, high = min(amounts[:2]), max(amounts[:2])
+    period = next((name for name, pattern in _PERIODS if pattern.search(text)), None)
+    if period is None:
+        period = "hour" if high < 200 else "day" if high < 5000 else "year"
+    return low, high, period
+
+
+def normalize_jobs(jobs, now=None):
+    """
+    Fill date_posted and the salary fields on a batch of parsed jobs, in place.
+
+    One `now` is used for the whole batch, and the string parsers are cached,
+    so the many repeats of "1 day ago" or "£500 per day" in a crawl are
+    parsed once. Jobs that already carry a date_posted keep it; an
+    unparseable posted value falls back to `now`.
+    """
+    now = now or datetime.utcnow()
+    for job in jobs:
+        if not job.get("date_posted"):
+            job["date_posted"] = parse_posted(job.get("posted"), now) or now
+        if "salary_min" not in job:
+            job["salary_min"], job["salary_max"], job["salary_period"] = parse_salary(job.get("salary") or None)
+    return jobs
@@ -0,0 +1,232 @@
+"""
+HTML parser backends behind one small node API.
+
+Every scraper parses pages through parse_html(), which returns a root Node
+whatever the backend:
+
+    node.select(css)            -> [Node]
+    node.select_one(css)        -> Node | None
+    node.text(sep="")           -> stripped text of the subtree, pieces joined by sep
+    node.attr(name)             -> attribute value or ""
+    node.text_of(css, sep="")   -> text of the first match, or ""
+    node.attr_of(css, name)     -> attribute of the first match, or ""
+    node.walk()                 -> (depth, tag, attrs, el) for the node and each descendant element
+
+Backends, fastest first: selectolax, lxml (+ cssselect), BeautifulSoup. The
+first one importable is used unless PARSER_BACKEND names one explicitly.
+CSS selectors are compiled once per backend and cached.
+"""
+import os
+from functools import lru_cache
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.etree
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    CSSSelector = None
+
+try:
+    import soupsieve
+    from bs4 import BeautifulSoup, SoupStrainer, Tag
+except ImportError:
+    BeautifulSoup = None
+
+
+class Node:
+    def select(self, css):
+        raise NotImplementedError
+
+    def select_one(self, css):
+        raise NotImplementedError
+
+    def text(self, sep=""):
+        raise NotImplementedError
+
+    def attr(self, name):
+        raise NotImplementedError
+
+    def walk(self):
+        """
+        Yield (depth, tag, attrs, el) for this node (depth 0) and every
+        descendant element in document order. `el` is the backend element;
+        wrap it with type(node)(el). One pass, for matching many selectors at
+        once (see specs.CardMatcher).
+        """
+        raise NotImplementedError
+
+    def text_of(self, css, sep=""):
+        node = self.select_one(css)
+        return node.text(sep) if node is not None else ""
+
+    def attr_of(self, css, name):
+        node = self.select_one(css)
+        return node.attr(name) if node is not None else ""
+
+
+def _join(parts, sep):
+    return sep.join(p for p in (part.strip() for part in parts) if p)
+
+
+# -----------------------------------
+# selectolax (lexbor)
+# -----------------------------------
+class SelectolaxNode(Node):
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    def select(self, css):
+        return [SelectolaxNode(el) for el in self.el.css(css)]
+
+    def select_one(self, css):
+        el = self.el.css_first(css)
+        return SelectolaxNode(el) if el is not None else None
+
+    def text(self, sep=""):
+        return _join((n.text_content or "" for n in self.el.traverse(include_text=True) if n.tag == "-text"), sep)
+
+    def attr(self, name):
+        return self.el.attributes.get(name) or ""
+
+    def walk(self):
+        stack = [(0, self.el)]
+        while stack:
+            depth, el = stack.pop()
+            if el.tag[0] == "-":  # comments
+                continue
+            yield depth, el.tag, el.attributes, el
+            stack.extend((depth + 1, child) for child in reversed(list(el.iter())))
+
+
+def _parse_selectolax(html_text, only=None):
+    return SelectolaxNode(LexborHTMLParser(html_text).root)
+
+
+# -----------------------------------
+# lxml
+# -----------------------------------
+@lru_cache(maxsize=None)
+def _lxml_selector(css):
+    return CSSSelector(css)
+
+
+class LxmlNode(Node):
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    def select(self, css):
+        return [LxmlNode(el) for el in _lxml_selector(css)(self.el)]
+
+    def select_one(self, css):
+        matches = _lxml_selector(css)(self.el)
+        return LxmlNode(matches[0]) if matches else None
+
+    def text(self, sep=""):
+        return _join(self.el.xpath("descendant-or-self::text()"), sep)
+
+    def attr(self, name):
+        return self.el.get(name) or ""
+
+    def walk(self):
+        depth = 0
+        for event, el in lxml.etree.iterwalk(self.el, events=("start", "end")):
+            if event == "end":
+                depth -= 1
+                continue
+            if isinstance(el.tag, str):  # skip comments and PIs
+                yield depth, el.tag, el.attrib, el
+            depth += 1
+
+
+def _parse_lxml(html_text, only=None):
+    if not html_text or not html_text.strip():
+        return LxmlNode(lxml.html.fromstring("<html></html>"))
+    # bytes, so pages that start with an <?xml encoding=...?> declaration parse too
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    return LxmlNode(lxml.html.document_fromstring(html_text.encode("utf-8"), parser=parser))
+
+
+# -----------------------------------
+# BeautifulSoup (fallback)
+# -----------------------------------
+@lru_cache(maxsize=None)
+def _bs4_selector(css):
+    return soupsieve.compile(css)
+
+
+class Bs4Node(Node):
+    __slots__ = ("el",)
+
+    def __init__(self, el):
+        self.el = el
+
+    def select(self, css):
+        return [Bs4Node(el) for el in _bs4_selector(css).select(self.el)]
+
+    def select_one(self, css):
+        el = _bs4_selector(css).select_one(self.el)
+        return Bs4Node(el) if el is not None else None
+
+    def text(self, sep=""):
+        return self.el.get_text(sep, strip=True)
+
+    def attr(self, name):
+        value = self.el.get(name)
+        return " ".join(value) if isinstance(value, list) else (value or "")
+
+    def walk(self):
+        stack = [(0, self.el)]
+        while stack:
+            depth, el = stack.pop()
+            yield depth, el.name, el.attrs, el
+            stack.extend((depth + 1, child) for child in reversed(el.contents) if isinstance(child, Tag))
+
+
+def _parse_bs4(html_text, only=None):
+    features = "lxml" if CSSSelector else "html.parser"
+    strainer = SoupStrainer(*only) if only else None
+    return Bs4Node(BeautifulSoup(html_text or "", features, parse_only=strainer))
+
+
+BACKENDS = {
+    "selectolax": (LexborHTMLParser, _parse_selectolax),
+    "lxml": (CSSSelector, _parse_lxml),
+    "bs4": (BeautifulSoup, _parse_bs4),
+}
+
+
+def _pick_backend(name):
+    if name != "auto":
+        available, parse = BACKENDS[name]
+        if available is None:
+            raise ImportError(f"Parser backend '{name}' is not installed")
+        return name, parse
+    for name, (available, parse) in BACKENDS.items():
+        if available is not None:
+            return name, parse
+    raise ImportError("No HTML parser installed (selectolax, lxml+cssselect or beautifulsoup4)")
+
+
+BACKEND, _parse = _pick_backend(os.getenv("PARSER_BACKEND", "auto"))
+
+
+def parse_html(html_text, only=None):
+    """
+    Parse a page with the active backend and return its root Node.
+
+    Args:
+        only: optional SoupStrainer args, e.g. ("article",). The bs4 backend
+              then only builds the matching subtrees; the C backends parse
+              the whole page, which is already cheaper than the strained
+              bs4 tree.
+    """
+    return _parse(html_text, only)
@@ -0,0 +1,51 @@
+import cProfile
+import pstats
+import sys
+import threading
+
+# from 3.12 cProfile sits on sys.monitoring, which already sees every thread
+_PER_THREAD = sys.version_info < (3, 12)
+
+
+class ThreadProfiler:
+    """
+    cProfile for the whole process, not just the calling thread.
+
+    Before 3.12 a cProfile.Profile only records the thread that enabled it,
+    while the scrapers do their work on pool threads and the broker loop
+    thread. Every thread started while the profiler runs gets its own
+    Profile (installed through threading.setprofile), and stop() merges
+    them with the main thread's into one stats file.
+    """
+
+    def __init__(self):
+        self.main = cProfile.Profile()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _start_thread(self, frame, event, arg):
+        profile = cProfile.Profile()
+        with self._lock:
+            self._threads.append(profile)
+        profile.enable()  # replaces this hook for the rest of the thread
+
+    def start(self):
+        if _PER_THREAD:
+            threading.setprofile(self._start_thread)
+        self.main.enable()
+
+    def stop(self, path):
+        """Stop profiling and write the merged stats to `path`."""
+        self.main.disable()
+        if _PER_THREAD:
+            threading.setprofile(None)
+        stats = pstats.Stats(self.main)
+        with self._lock:
+            profiles = list(self._threads)
+        for profile in profiles:
+            try:
+                stats.add(profile)
+            except TypeError:
+                pass  # thread never made a call after its hook ran: nothing recorded
+        stats.dump_stats(path)
+        return stats
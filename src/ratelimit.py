@@ -0,0 +1,55 @@
+import asyncio
+import os
+import threading
+import time
+
+DEFAULT_RATE = float(os.getenv("HOST_RATE", 2.0))   # requests per second per host
+DEFAULT_BURST = float(os.getenv("HOST_BURST", 2))
+
+_lock = threading.Lock()
+_buckets = {}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens=1):
+        """Take `tokens` and return 0 if available, else return the seconds to wait before trying again."""
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0
+            return (tokens - self.tokens) / self.rate
+
+    async def acquire_async(self, tokens=1):
+        """Wait until `tokens` are available, then take them; sleeps without blocking the event loop."""
+        while True:
+            wait = self.reserve(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+def bucket_for(host):
+    """Return the process-wide bucket for a host, shared by every scraper."""
+    with _lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(DEFAULT_RATE, DEFAULT_BURST)
+        return _buckets[host]
+
+
+async def acquire_async(host):
+    await bucket_for(host).acquire_async()
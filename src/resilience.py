@@ -0,0 +1,119 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from . import metrics
+
+RETRIES = int(os.getenv("REQUEST_RETRIES", 2))
+BACKOFF_BASE = float(os.getenv("REQUEST_BACKOFF_BASE", 1.0))   # seconds, doubled per retry
+BACKOFF_MAX = float(os.getenv("REQUEST_BACKOFF_MAX", 30.0))
+CB_FAILURES = int(os.getenv("CIRCUIT_FAILURES", 5))            # consecutive failures that open the circuit
+CB_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN", 120.0))      # seconds to fail fast once open
+# adaptive timeout = p95 of recent successes × multiplier, clamped to [min, caller's maxTimeout]
+TIMEOUT_MULTIPLIER = float(os.getenv("TIMEOUT_P95_MULTIPLIER", 2.0))
+TIMEOUT_MIN_MS = int(os.getenv("TIMEOUT_MIN_MS", 15000))
+TIMEOUT_MIN_SAMPLES = 20
+HEDGE_ENABLED = os.getenv("HEDGE_LISTINGS", "0") != "0"
+
+_lock = threading.Lock()
+_policies = {}
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class HostPolicy:
+    """Latency window and circuit-breaker state for one target host."""
+
+    def __init__(self, host):
+        self.host = host
+        self.latencies = deque(maxlen=200)
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def p95(self):
+        with self._lock:
+            if len(self.latencies) < TIMEOUT_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def timeout_ms(self, max_ms):
+        p95 = self.p95()
+        if p95 is None:
+            return max_ms
+        return int(min(max_ms, max(TIMEOUT_MIN_MS, p95 * 1000 * TIMEOUT_MULTIPLIER)))
+
+    def check(self):
+        """Raise CircuitOpenError while the circuit is open; let one trial through after the cool-down."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < CB_COOLDOWN or self.trial_in_flight:
+                raise CircuitOpenError(f"Circuit open for {self.host}; failing fast")
+            self.trial_in_flight = True  # half-open
+
+    def success(self, latency):
+        with self._lock:
+            self.latencies.append(latency)
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            was_trial, self.trial_in_flight = self.trial_in_flight, False
+            if was_trial or (self.opened_at is None and self.failures >= CB_FAILURES):
+                self.opened_at = time.monotonic()
+                metrics.inc("circuit_opened_total", host=self.host)
+                print(f"[!] Circuit opened for {self.host} after {self.failures} failures")
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+
+def policy_for(host):
+    with _lock:
+        if host not in _policies:
+            _policies[host] = HostPolicy(host)
+        return _policies[host]
+
+
+def backoff(attempt):
+    """Full-jitter exponential backoff for retry number `attempt` (1-based)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+async def hedged(call, delay):
+    """
+    Await call(); if it has not finished after `delay` seconds, start a
+    duplicate and return whichever succeeds first. The loser keeps running
+    in the background and its result is discarded.
+    """
+    first = asyncio.ensure_future(call())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+    metrics.inc("hedged_requests_total")
+    second = asyncio.ensure_future(call())
+    pending = {first, second}
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None or not pending:
+                for loser in pending:
+                    loser.add_done_callback(_discard)
+                return future.result()
+
+
+def _discard(future):
+    if not future.cancelled():
+        future.exception()  # retrieve it so asyncio does not log it as unhandled
@@ -0,0 +1,148 @@
+import heapq
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+
+SCHEDULE_INTERVAL = float(os.getenv("SCHEDULE_INTERVAL", 900))        # starting interval per source (s)
+SCHEDULE_MIN = float(os.getenv("SCHEDULE_MIN_INTERVAL", 300))
+SCHEDULE_MAX = float(os.getenv("SCHEDULE_MAX_INTERVAL", 6 * 3600))
+SCHEDULE_TARGET_NEW = float(os.getenv("SCHEDULE_TARGET_NEW", 5))     # new jobs we aim to find per run
+SCHEDULE_BACKOFF = float(os.getenv("SCHEDULE_BACKOFF", 1.5))         # interval growth after a run with nothing new
+SCHEDULE_JITTER = float(os.getenv("SCHEDULE_JITTER", 0.1))           # +/- fraction applied to every interval
+SCHEDULER_CONCURRENCY = int(os.getenv("SCHEDULER_CONCURRENCY", 2))   # sources crawling at once, process-wide
+
+
+class SourceSchedule:
+    def __init__(self, name, cls, interval=SCHEDULE_INTERVAL):
+        self.name = name
+        self.cls = cls
+        self.interval = interval
+        self.last_run = None
+        self.runs = 0
+
+    def adapt(self, summary, now):
+        """
+        Move the interval toward the time it takes this source to post
+        SCHEDULE_TARGET_NEW new jobs; back off when a run found nothing or
+        failed.
+        """
+        new = summary.get("new", 0)
+        if summary.get("error"):
+            self.interval *= SCHEDULE_BACKOFF * 2
+        elif new == 0:
+            self.interval *= SCHEDULE_BACKOFF
+        else:
+            window = now - self.last_run if self.last_run else self.interval
+            ideal = SCHEDULE_TARGET_NEW * window / new
+            # halve the gap each run so one burst does not swing the interval
+            self.interval = (self.interval + ideal) / 2
+        self.interval = min(SCHEDULE_MAX, max(SCHEDULE_MIN, self.interval))
+        self.last_run = now
+        self.runs += 1
+
+    def next_delay(self):
+        return self.interval * random.uniform(1 - SCHEDULE_JITTER, 1 + SCHEDULE_JITTER)
+
+
+class Scheduler:
+    """
+    Long-running crawl loop with one adaptive schedule per source.
+
+    Sources run on a shared pool capped at `concurrency`, so however many
+    fall due together, at most that many crawls hit the broker at once. A
+    source is only rescheduled once its run finishes, so it never overlaps
+    itself. First runs are spread over the first few minutes instead of all
+    starting at boot. Learned intervals are kept in Redis (when available)
+    so a restart does not forget them.
+
+    Args:
+        sources: (name, scraper class) pairs
+        runner: callable(name, cls) -> summary dict with "new" and "error"
+        redis_client: optional, for persisting intervals
+    """
+
+    def __init__(self, sources, runner, redis_client=None, concurrency=SCHEDULER_CONCURRENCY, key="jobs:schedule"):
+        self.runner = runner
+        self.redis = redis_client
+        self.key = key
+        self.concurrency = concurrency
+        self.schedules = {name: SourceSchedule(name, cls) for name, cls in sources}
+        self._heap = []  # (due time, name)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._restore()
+
+    def _restore(self):
+        if not self.redis:
+            return
+        try:
+            saved = self.redis.hgetall(self.key)
+        except Exception as e:
+            print(f"[!] Schedule lookup failed: {e}")
+            return
+        for name, raw in saved.items():
+            if name in self.schedules:
+                state = json.loads(raw)
+                self.schedules[name].interval = state["interval"]
+                self.schedules[name].last_run = state.get("last_run")
+
+    def _save(self, schedule):
+        if not self.redis:
+            return
+        try:
+            self.redis.hset(self.key, schedule.name, json.dumps({"interval": schedule.interval, "last_run": schedule.last_run}))
+        except Exception as e:
+            print(f"[!] Schedule update failed: {e}")
+
+    def _push(self, name, due):
+        with self._cond:
+            heapq.heappush(self._heap, (due, name))
+            self._cond.notify()
+
+    def _run(self, schedule):
+        summary = self.runner(schedule.name, schedule.cls)
+        schedule.adapt(summary, time.time())
+        self._save(schedule)
+        metrics.inc("scheduled_runs_total", source=schedule.name, outcome="error" if summary.get("error") else "ok")
+        metrics.inc("scheduled_new_jobs_total", summary.get("new", 0), source=schedule.name)
+        delay = schedule.next_delay()
+        print(f"[i] {schedule.name}: {summary.get('new', 0)} new; next run in {delay / 60:.1f} min")
+        self._push(schedule.name, time.time() + delay)
+
+    def run(self):
+        """Crawl until stop() is called."""
+        now = time.time()
+        for schedule in self.schedules.values():
+            self._push(schedule.name, now + random.uniform(0, min(schedule.interval, SCHEDULE_MIN)))
+        print(f"🕒 Scheduler started: {len(self.schedules)} sources, {self.concurrency} at a time")
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while not self._stop.is_set():
+                with self._cond:
+                    wait = self._heap[0][0] - time.time() if self._heap else None
+                    if wait is None or wait > 0:
+                        self._cond.wait(timeout=wait)
+                        continue
+                    _, name = heapq.heappop(self._heap)
+                # due sources beyond the cap queue inside the pool, in due order
+                pool.submit(self._guarded, self.schedules[name])
+        print("[✓] Scheduler stopped")
+
+    def _guarded(self, schedule):
+        if self._stop.is_set():
+            return
+        try:
+            self._run(schedule)
+        except Exception as e:
+            # never lose a source from the schedule
+            print(f"[!] Scheduling {schedule.name} failed: {e}")
+            self._push(schedule.name, time.time() + schedule.next_delay())
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
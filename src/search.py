@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from . import db
+
+# ts_headline (and the description lookup) only runs on the rows of the returned page, never on every match
+_HEADLINE_SQL = f"ts_headline('english', COALESCE({db.DESCRIPTION_SQL}, ''), q, 'MaxFragments=1, MaxWords=30, MinWords=10')"
+
+
+def encode_cursor(row):
+    """Opaque keyset cursor for the row after which the next page starts."""
+    return f"{row['date_posted'].isoformat()}|{row['id']}"
+
+
+def decode_cursor(cursor):
+    posted, job_id = cursor.rsplit("|", 1)
+    return datetime.fromisoformat(posted), int(job_id)
+
+
+def search_jobs(
+    pool, query=None, source=None, since=None, until=None, limit=20, after=None, min_rate=None, period="day"
+):
+    """
+    Newest-first job search with keyset pagination.
+
+    Keyword matching uses the GIN-indexed `search` tsvector (title weighted
+    over company over description) with websearch syntax, e.g.
+    `django -junior "outside ir35"`. Results are ordered by
+    (date_posted, id) so each page is an index range scan that starts
+    where the previous one stopped, however deep the page.
+
+    Args:
+        pool: PostgreSQL pool from db.get_pg_pool
+        query: websearch-style keywords (optional)
+        source: SOURCE name to limit to, e.g. "Reed" (optional)
+        since / until: date_posted range, inclusive / exclusive (optional)
+        min_rate: only jobs whose top salary per `period` reaches this (optional)
+        period: salary period for min_rate: "hour", "day", "week", "month" or "year"
+        limit: page size
+        after: cursor returned with the previous page
+
+    Returns:
+        (rows, cursor): rows are dicts with id, source, company, title, link,
+        location, salary, salary_min, salary_max, salary_period, date_posted
+        and, when querying, a highlighted `snippet`; cursor is None on the
+        last page.
+    """
+    clauses, params = [], []
+    if query:
+        clauses.append("search @@ q")
+    if source:
+        clauses.append("source = %s")
+        params.append(source)
+    if since:
+        clauses.append("date_posted >= %s")
+        params.append(since)
+    if until:
+        clauses.append("date_posted < %s")
+        params.append(until)
+    if min_rate is not None:
+        clauses.append("salary_period = %s AND salary_max >= %s")
+        params.extend([period, min_rate])
+    if after:
+        clauses.append("(date_posted, id) < (%s, %s)")
+        params.extend(decode_cursor(after))
+
+    columns = [
+        "id", "source", "company", "title", "link", "location",
+        "salary", "salary_min", "salary_max", "salary_period", "date_posted",
+    ]
+    select = ", ".join(columns)
+    if query:
+        select += f", {_HEADLINE_SQL} AS snippet"
+        columns.append("snippet")
+    sql = f"""
+        SELECT {select}
+        FROM jobs{", websearch_to_tsquery('english', %s) AS q" if query else ""}
+        WHERE {" AND ".join(clauses) or "TRUE"}
+        ORDER BY date_posted DESC, id DESC
+        LIMIT %s
+    """
+    params = ([query] if query else []) + params + [limit + 1]
+
+    with db.pg_connection(pool) as conn, conn.cursor() as cur:
+        cur.execute(sql, params)
+        rows = [dict(zip(columns, values)) for values in cur.fetchall()]
+    # one extra row tells us whether another page exists
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]) if more else None
@@ -0,0 +1,70 @@
+import os
+import time
+
+SEEN_TTL = int(os.getenv("SEEN_TTL", 7 * 24 * 3600))  # seconds; 0 disables the cache
+
+
+class SeenLinks:
+    """
+    Redis-backed cache of job links whose full description is already stored.
+
+    Links live in one sorted set scored by when their detail page was last
+    fetched, so entries older than `ttl` count as unknown again (and get
+    re-fetched) and are pruned on the next write.
+    """
+
+    def __init__(self, redis_client, key="jobs:seen", ttl=SEEN_TTL):
+        self.redis = redis_client
+        self.key = key
+        self.ttl = ttl
+
+    def known(self, links):
+        """Return the subset of links fetched within the TTL."""
+        links = [link for link in links if link]
+        if not links:
+            return set()
+        cutoff = time.time() - self.ttl
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for link in links:
+                pipe.zscore(self.key, link)
+            scores = pipe.execute()
+        except Exception as e:
+            print(f"[!] Seen-link lookup failed: {e}")
+            return set()
+        return {link for link, score in zip(links, scores) if score is not None and score >= cutoff}
+
+    def mark(self, links):
+        """Record links as freshly fetched and drop expired entries."""
+        links = [link for link in links if link]
+        if not links:
+            return
+        now = time.time()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zadd(self.key, {link: now for link in links})
+            pipe.zremrangebyscore(self.key, 0, now - self.ttl)
+            pipe.execute()
+        except Exception as e:
+            print(f"[!] Seen-link update failed: {e}")
+
+
+class Watermarks:
+    """Per-source high-water mark: the newest listing link seen by the last completed crawl."""
+
+    def __init__(self, redis_client, key="jobs:watermark"):
+        self.redis = redis_client
+        self.key = key
+
+    def get(self, source):
+        try:
+            return self.redis.hget(self.key, source)
+        except Exception as e:
+            print(f"[!] Watermark lookup failed: {e}")
+            return None
+
+    def set(self, source, link):
+        try:
+            self.redis.hset(self.key, source, link)
+        except Exception as e:
+            print(f"[!] Watermark update failed: {e}")
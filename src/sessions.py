@@ -0,0 +1,144 @@
+import asyncio
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import requests
+
+from .broker import BrokerUnavailable
+
+SESSION_MAX_USES = int(os.getenv("SESSION_MAX_USES", 50))
+SESSION_PER_HOST = int(os.getenv("SESSION_PER_HOST", 4))
+SESSION_THREADS = int(os.getenv("SESSION_THREADS", 16))  # lease_async waiters blocked in _acquire, per pool
+
+_lock = threading.Lock()
+_pools = {}
+
+
+class BrokerSession:
+    def __init__(self, session_id, host):
+        self.id = session_id
+        self.host = host
+        self.uses = 0
+        self.broken = False
+
+
+class BrokerSessionPool:
+    """
+    Pool of FlareSolverr browser sessions, keyed by target host.
+
+    Each session is leased to one caller at a time so cookies and challenge
+    clearance carry over between listing and detail fetches on the same site.
+    Sessions are destroyed and replaced after `max_uses` requests or as soon
+    as a request made with them fails.
+    """
+
+    def __init__(self, broker_url, max_uses=SESSION_MAX_USES, per_host=SESSION_PER_HOST):
+        self.broker_url = broker_url
+        self.max_uses = max_uses
+        self.per_host = per_host
+        self._http = requests.Session()
+        self._cond = threading.Condition()
+        self._idle = {}    # host -> [BrokerSession]
+        self._open = {}    # host -> number of live sessions (idle + leased)
+        # lease_async blocks on these, never on the event loop's default executor
+        self._executor = ThreadPoolExecutor(max_workers=SESSION_THREADS, thread_name_prefix="broker-session")
+
+    def _command(self, payload):
+        try:
+            resp = self._http.post(self.broker_url, json=payload, timeout=70)
+            resp.raise_for_status()
+            return resp.json()
+        except requests.ConnectionError as e:
+            raise BrokerUnavailable(f"Broker {payload['cmd']} failed: {e}") from e
+        except requests.RequestException as e:
+            raise RuntimeError(f"Broker {payload['cmd']} failed: {e}") from e
+
+    def _create(self, host):
+        session_id = f"{host}-{uuid.uuid4().hex[:8]}"
+        result = self._command({"cmd": "sessions.create", "session": session_id})
+        if isinstance(result, dict) and result.get("status") == "error":
+            raise RuntimeError(f"Broker sessions.create failed: {result.get('message') or 'error status'}")
+        return BrokerSession(session_id, host)
+
+    def _destroy(self, session):
+        try:
+            self._command({"cmd": "sessions.destroy", "session": session.id})
+        except Exception as e:
+            print(f"[!] Failed to destroy broker session {session.id}: {e}")
+
+    def _acquire(self, host):
+        with self._cond:
+            while True:
+                idle = self._idle.setdefault(host, [])
+                if idle:
+                    return idle.pop()
+                if self._open.get(host, 0) < self.per_host:
+                    self._open[host] = self._open.get(host, 0) + 1
+                    break
+                self._cond.wait()
+        # create outside the lock; it is a full broker round trip
+        try:
+            return self._create(host)
+        except Exception:
+            with self._cond:
+                self._open[host] -= 1
+                self._cond.notify()
+            raise
+
+    def _return(self, session):
+        """Put a session back (or drop it from the count); True if it must be destroyed."""
+        retire = session.broken or session.uses >= self.max_uses
+        with self._cond:
+            if retire:
+                self._open[session.host] -= 1
+            else:
+                self._idle[session.host].append(session)
+            self._cond.notify()
+        return retire
+
+    @asynccontextmanager
+    async def lease_async(self, host):
+        """
+        Borrow a session for `host`; it is marked broken on error so it is
+        recycled. Waiting for a free session and creating or destroying one
+        run on the pool's own threads; handing it back is immediate.
+        """
+        loop = asyncio.get_running_loop()
+        session = await loop.run_in_executor(self._executor, self._acquire, host)
+        try:
+            yield session
+            session.uses += 1
+        except Exception:
+            session.broken = True
+            raise
+        finally:
+            if self._return(session):
+                await loop.run_in_executor(self._executor, self._destroy, session)
+
+    def close(self):
+        with self._cond:
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+            self._open.clear()
+        for session in sessions:
+            self._destroy(session)
+        self._executor.shutdown(wait=False)
+
+
+def pool_for(broker_url):
+    """Return the process-wide session pool for a broker endpoint."""
+    with _lock:
+        if broker_url not in _pools:
+            _pools[broker_url] = BrokerSessionPool(broker_url)
+        return _pools[broker_url]
+
+
+def close_all():
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,335 @@
+"""
+Declarative site specs for listing scrapers.
+
+A listing site is described by data instead of a hand-written parse():
+
+    SiteSpec(
+        source="CVLibrary",
+        url="https://www.cv-library.co.uk/django-contractor-jobs?us=1",
+        card="article.job.search-card",
+        fields={
+            "title": "h2.job__title a",
+            "url": Field("h2.job__title a", attr="href"),
+            "description": Field(".job__description", sep=" "),
+        },
+        url_prefix="https://www.cv-library.co.uk",
+    )
+
+Each spec is compiled once into a CardMatcher. Instead of one select_one()
+per field, the matcher walks each card subtree once and tests every element
+against all field selectors, stopping as soon as every field has its first
+match. Fields sharing a selector (a title link's text and href) share the
+match. Selectors are limited to tags, #id, .class and [attr] / [attr=v]
+(also ~= ^= $= *=) joined by descendant or child combinators; a field
+using anything else falls back to select_one().
+
+Pagination: put "{page}" in the URL (or in a POST payload value) and set
+`pages`; the first page number is `first_page`. Give `detail` a selector to
+fetch each card's detail page and take its text as the description.
+"""
+import html
+import re
+
+from .base import BaseClient
+from .parsing import parse_html
+
+
+class Field:
+    """How to read one card field: text of the first `css` match, or its `attr`."""
+
+    def __init__(self, css, attr=None, sep=""):
+        self.css = css
+        self.attr = attr
+        self.sep = sep
+
+
+class SiteSpec:
+    """
+    One listing site.
+
+    Args:
+        source: SOURCE name used in logs, metrics and the jobs table
+        url: listing URL, with "{page}" if paginated
+        card: selector for one job card
+        fields: name -> Field or selector string (text of the first match)
+        url_prefix: base for relative links in the "url" field
+        pages: listing pages per crawl when paginated
+        first_page: page number of the first page
+        method: "get" or "post"
+        payload: POST form data; values may contain "{page}"
+        detail: selector for the description on the job's own page
+        strategy: FETCH_STRATEGY ("broker" or "direct")
+        unescape: HTML-unescape the page before parsing (markup embedded in XML)
+        only: bs4 SoupStrainer args, e.g. ("article",)
+    """
+
+    def __init__(
+        self, source, url, card, fields, url_prefix="", pages=1, first_page=1, method="get", payload=None,
+        detail=None, strategy="broker", unescape=False, only=None,
+    ):
+        self.source = source
+        self.url = url
+        self.card = card
+        self.fields = {name: field if isinstance(field, Field) else Field(field) for name, field in fields.items()}
+        self.url_prefix = url_prefix
+        self.pages = pages
+        self.first_page = first_page
+        self.method = method
+        self.payload = payload
+        self.detail = detail
+        self.strategy = strategy
+        self.unescape = unescape
+        self.only = only
+        self.paginated = "{page}" in url or any("{page}" in str(v) for v in (payload or {}).values())
+        self.matcher = CardMatcher(self.fields)
+
+    def page_request(self, page):
+        """(url, payload) for a 0-based listing page."""
+        number = page + self.first_page
+        url = self.url.format(page=number) if "{page}" in self.url else self.url
+        payload = {k: str(v).replace("{page}", str(number)) for k, v in self.payload.items()} if self.payload else None
+        return url, payload
+
+
+# -----------------------------------
+# Selector compiler
+# -----------------------------------
+_TOKEN = re.compile(
+    r"""
+    (?P<child>\s*>\s*)
+    | (?P<space>\s+)
+    | (?P<tag>[a-zA-Z][\w-]*|\*)
+    | \#(?P<id>[\w-]+)
+    | \.(?P<cls>[\w-]+)
+    | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[~^$*]?=)\s*(?P<value>"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+    """,
+    re.VERBOSE,
+)
+
+
+class _Compound:
+    __slots__ = ("tag", "classes", "attrs")
+
+    def __init__(self):
+        self.tag = None
+        self.classes = []
+        self.attrs = []  # (name, op, value)
+
+    def matches(self, tag, attrs):
+        if self.tag and tag != self.tag:
+            return False
+        if self.classes:
+            value = attrs.get("class")
+            names = (value if isinstance(value, list) else (value or "").split())
+            if any(name not in names for name in self.classes):
+                return False
+        for name, op, expected in self.attrs:
+            if name not in attrs:
+                return False
+            if op is None:
+                continue
+            value = attrs[name]
+            value = " ".join(value) if isinstance(value, list) else (value or "")
+            if not (
+                (op == "=" and value == expected)
+                or (op == "~=" and expected in value.split())
+                or (op == "^=" and value.startswith(expected))
+                or (op == "$=" and value.endswith(expected))
+                or (op == "*=" and expected in value)
+            ):
+                return False
+        return True
+
+
+def compile_selector(css):
+    """
+    Compile a selector into its compounds, rightmost first, as
+    [(compound, combinator to the next one)], or None if it uses anything
+    beyond the supported subset.
+    """
+    css = css.strip()
+    parts, combinators, current = [], [], _Compound()
+    pos, empty = 0, True
+    while pos < len(css):
+        match = _TOKEN.match(css, pos)
+        if not match:
+            return None
+        pos = match.end()
+        if match["child"] or match["space"]:
+            if empty:
+                return None
+            parts.append(current)
+            combinators.append(">" if match["child"] else " ")
+            current, empty = _Compound(), True
+            continue
+        empty = False
+        if match["tag"]:
+            current.tag = None if match["tag"] == "*" else match["tag"].lower()
+        elif match["id"]:
+            current.attrs.append(("id", "=", match["id"]))
+        elif match["cls"]:
+            current.classes.append(match["cls"])
+        else:
+            value = match["value"]
+            if value and value[0] in "'\"":
+                value = value[1:-1]
+            current.attrs.append((match["attr"], match["op"], value))
+    if empty:
+        return None
+    parts.append(current)
+    # right to left: each compound with the combinator linking it to the next one leftwards
+    return list(zip(reversed(parts), list(reversed(combinators)) + [None]))
+
+
+def _match(chain, tag, attrs, ancestors):
+    if not chain[0][0].matches(tag, attrs):
+        return False
+    return _match_up(chain, 1, chain[0][1], ancestors, len(ancestors))
+
+
+def _match_up(chain, index, combinator, ancestors, top):
+    """Match chain[index:] against ancestors[:top], `combinator` linking it to the part below."""
+    if index == len(chain):
+        return True
+    compound, next_combinator = chain[index]
+    candidates = range(top - 1, -1, -1) if combinator == " " else range(top - 1, top - 2, -1)
+    for i in candidates:
+        if i < 0:
+            break
+        tag, attrs = ancestors[i]
+        if compound.matches(tag, attrs) and _match_up(chain, index + 1, next_combinator, ancestors, i):
+            return True
+    return False
+
+
+class CardMatcher:
+    """
+    Extracts every field of a card in a single traversal of its subtree.
+
+    Selectors are matched innermost compound first; ancestors come from the
+    walk's own stack, so matching an element costs no extra tree lookups.
+    The card element itself can satisfy an ancestor compound but is never a
+    match, as with select_one() on the card.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.selectors = []  # (css, chain, tag, attribute), one per distinct supported selector
+        self.fallback = []   # selectors only select_one() understands
+        seen = set()
+        for field in fields.values():
+            if field.css in seen:
+                continue
+            seen.add(field.css)
+            chain = compile_selector(field.css)
+            if chain is None:
+                self.fallback.append(field.css)
+            else:
+                # cheap pre-checks on the rightmost compound before the full match
+                target = chain[0][0]
+                key = "class" if target.classes else target.attrs[0][0] if target.attrs else None
+                self.selectors.append((field.css, chain, target.tag, key))
+
+    def find(self, card):
+        """First match per selector: {css: Node}, missing selectors left out."""
+        found = {}
+        if self.selectors:
+            pending = list(self.selectors)
+            ancestors = []
+            wrap = type(card)
+            for depth, tag, attrs, el in card.walk():
+                del ancestors[depth:]
+                if not depth:  # the card itself
+                    ancestors.append((tag, attrs))
+                    continue
+                for entry in pending:
+                    css, chain, need_tag, need_attr = entry
+                    if (need_tag and need_tag != tag) or (need_attr and need_attr not in attrs):
+                        continue
+                    if _match(chain, tag, attrs, ancestors):
+                        found[css] = wrap(el)
+                        pending = [p for p in pending if p is not entry]
+                if not pending:
+                    break
+                ancestors.append((tag, attrs))
+        for css in self.fallback:
+            node = card.select_one(css)
+            if node is not None:
+                found[css] = node
+        return found
+
+    def extract(self, card):
+        found = self.find(card)
+        values = {}
+        for name, field in self.fields.items():
+            node = found.get(field.css)
+            if node is None:
+                values[name] = ""
+            else:
+                values[name] = node.attr(field.attr) if field.attr else node.text(field.sep)
+        return values
+
+
+def parse_cards(spec, html_text):
+    """Cards of one listing page as job dicts."""
+    if spec.unescape:
+        html_text = html.unescape(html_text or "")
+    root = parse_html(html_text, only=spec.only)
+    jobs = []
+    for card in root.select(spec.card):
+        job = spec.matcher.extract(card)
+        if job.get("url") and spec.url_prefix and "://" not in job["url"]:
+            job["url"] = spec.url_prefix + job["url"]
+        jobs.append(job)
+    return jobs
+
+
+class SpecScraper(BaseClient):
+    """
+    Scraper driven by a SiteSpec; subclasses only set SPEC.
+
+    SOURCE, HAS_DETAIL and FETCH_STRATEGY come from the spec unless the
+    class sets them itself (e.g. a subclass forcing FETCH_STRATEGY).
+    """
+
+    SPEC = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.SPEC is not None:
+            derived = {
+                "SOURCE": cls.SPEC.source,
+                "HAS_DETAIL": cls.SPEC.detail is not None,
+                "FETCH_STRATEGY": cls.SPEC.strategy,
+            }
+            for name, value in derived.items():
+                if name not in cls.__dict__:
+                    setattr(cls, name, value)
+
+    def __init__(self, pages=None, mode=None):
+        super().__init__()
+        self.pages = pages or self.SPEC.pages
+        self.crawl_mode = mode or self.crawl_mode
+
+    def fetch_listing(self, page):
+        if page and not self.SPEC.paginated:
+            return ""
+        url, payload = self.SPEC.page_request(page)
+        if self.SPEC.method == "post":
+            result = self._request("request.post", url, maxTimeout=60000, postData=payload, hedge=True, kind="listing")
+        else:
+            result = self._request("request.get", url, maxTimeout=60000, hedge=True, kind="listing")
+        return result.get("solution", {}).get("response", "") if isinstance(result, dict) else result
+
+    def iter_pages(self):
+        """Fetch listing pages lazily, one per pull from the pipeline."""
+        for page in range(self.page_limit(self.pages) if self.SPEC.paginated else 1):
+            yield self.fetch_listing(page)
+
+    def parse(self, html_text):
+        return parse_cards(self.SPEC, html_text)
+
+    def parse_detail(self, html_text):
+        if self.SPEC.unescape:
+            html_text = html.unescape(html_text or "")
+        return parse_html(html_text).text_of(self.SPEC.detail, " ")
@@ -0,0 +1,209 @@
+import json
+import os
+import random
+import threading
+import time
+import uuid
+
+from . import metrics
+
+VISIBILITY_TIMEOUT = int(os.getenv("QUEUE_VISIBILITY_TIMEOUT", 300))  # seconds a claimed task stays hidden
+MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", 5))
+RETRY_BASE = float(os.getenv("QUEUE_RETRY_BASE", 5))  # seconds, doubled per attempt
+POLL_INTERVAL = float(os.getenv("QUEUE_POLL_INTERVAL", 1.0))
+
+# Atomically take the first task whose visibility time has passed and hide it
+# for the visibility timeout. A worker that dies mid-task never acks, so the
+# task simply becomes visible again once the timeout expires.
+_CLAIM_LUA = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, 1)
+if #ids == 0 then return false end
+redis.call('ZADD', KEYS[1], ARGV[2], ids[1])
+redis.call('HINCRBY', KEYS[2], ids[1] .. ':attempts', 1)
+return ids[1]
+"""
+
+
+class WorkQueue:
+    """
+    Redis-backed task queue shared by any number of worker processes.
+
+    Each source has a sorted set of task ids scored by the time they become
+    visible. Task bodies live in one hash. Claiming a task pushes its score
+    forward by the visibility timeout; ack deletes it; a failed task is
+    rescheduled with exponential backoff until MAX_ATTEMPTS, then moved to
+    the source's dead-letter list.
+    """
+
+    def __init__(self, redis_client, prefix="jobs:queue"):
+        self.redis = redis_client
+        self.prefix = prefix
+        self.tasks_key = f"{prefix}:tasks"
+        self._claim = redis_client.register_script(_CLAIM_LUA)
+
+    def _queue_key(self, source):
+        return f"{self.prefix}:{source}"
+
+    def _dead_key(self, source):
+        return f"{self.prefix}:{source}:dead"
+
+    def push(self, source, kind, delay=0, **fields):
+        """Enqueue a task; returns its id."""
+        task_id = uuid.uuid4().hex
+        task = {"id": task_id, "source": source, "kind": kind, **fields}
+        pipe = self.redis.pipeline()
+        pipe.hset(self.tasks_key, task_id, json.dumps(task))
+        pipe.zadd(self._queue_key(source), {task_id: time.time() + delay})
+        pipe.execute()
+        return task_id
+
+    def claim(self, source, visibility=VISIBILITY_TIMEOUT):
+        """Claim the next visible task for a source, or None."""
+        now = time.time()
+        task_id = self._claim(keys=[self._queue_key(source), self.tasks_key], args=[now, now + visibility])
+        if not task_id:
+            return None
+        raw, attempts = self.redis.hmget(self.tasks_key, [task_id, f"{task_id}:attempts"])
+        if raw is None:
+            # body vanished (acked by a slower duplicate); drop the stray id
+            self.redis.zrem(self._queue_key(source), task_id)
+            return None
+        task = json.loads(raw)
+        task["attempts"] = int(attempts or 1)
+        return task
+
+    def ack(self, task):
+        pipe = self.redis.pipeline()
+        pipe.zrem(self._queue_key(task["source"]), task["id"])
+        pipe.hdel(self.tasks_key, task["id"], f"{task['id']}:attempts")
+        pipe.execute()
+
+    def fail(self, task, error):
+        """Retry with backoff, or dead-letter once MAX_ATTEMPTS is reached."""
+        if task["attempts"] >= MAX_ATTEMPTS:
+            dead = {**task, "error": str(error), "failed_at": time.time()}
+            pipe = self.redis.pipeline()
+            pipe.lpush(self._dead_key(task["source"]), json.dumps(dead))
+            pipe.zrem(self._queue_key(task["source"]), task["id"])
+            pipe.hdel(self.tasks_key, task["id"], f"{task['id']}:attempts")
+            pipe.execute()
+            print(f"[!] Dead-lettered {task['kind']} task for {task['source']}: {error}")
+            return
+        backoff = RETRY_BASE * 2 ** (task["attempts"] - 1) * random.uniform(0.5, 1.5)
+        self.redis.zadd(self._queue_key(task["source"]), {task["id"]: time.time() + backoff})
+
+    def requeue_dead(self, source):
+        """Move every dead-lettered task for a source back onto its queue."""
+        moved = 0
+        while True:
+            raw = self.redis.rpop(self._dead_key(source))
+            if raw is None:
+                return moved
+            task = json.loads(raw)
+            fields = {k: v for k, v in task.items() if k not in ("id", "source", "kind", "attempts", "error", "failed_at")}
+            self.push(source, task["kind"], **fields)
+            moved += 1
+
+    def stats(self, sources):
+        now = time.time()
+        return {
+            source: {
+                "ready": self.redis.zcount(self._queue_key(source), "-inf", now),
+                "scheduled_or_in_flight": self.redis.zcount(self._queue_key(source), f"({now}", "+inf"),
+                "dead": self.redis.llen(self._dead_key(source)),
+            }
+            for source in sources
+        }
+
+
+# -----------------------------------
+# Producer
+# -----------------------------------
+def enqueue_crawl(queue, scrapers):
+    """Start a crawl for each source by enqueueing its first listing page."""
+    for source in scrapers:
+        queue.push(source, "listing", page=0)
+        print(f"[+] Enqueued {source} crawl")
+
+
+# -----------------------------------
+# Consumer
+# -----------------------------------
+class Worker:
+    """
+    Consume listing and detail tasks for a set of sources.
+
+    Listing tasks fetch and parse one page, write its cards (listing-only
+    sources, or with DEFER_DETAILS) or enqueue a detail task per new card, and enqueue the next
+    page unless an incremental crawl has caught up. Detail tasks fetch one
+    description and upsert that job.
+    """
+
+    def __init__(self, queue, scrapers):
+        self.queue = queue
+        self.classes = scrapers  # source -> scraper class
+        self._scrapers = {}
+        self._stop = threading.Event()
+
+    def scraper(self, source):
+        if source not in self._scrapers:
+            self._scrapers[source] = self.classes[source]()
+        return self._scrapers[source]
+
+    def handle_listing(self, scraper, task):
+        page = task["page"]
+        html_text = scraper.fetch_listing(page)
+        with metrics.timed("parse_seconds", source=scraper.SOURCE):
+            cards = scraper.parse(html_text)
+        if not cards:
+            return
+        caught_up = scraper.crawl_mode == "incremental" and scraper.is_caught_up(cards, None)
+        if scraper.HAS_DETAIL and not scraper.DEFER_DETAILS:
+            known, fresh = scraper.split_known(cards)
+            written = scraper.write_jobs(known) if known else {"failed": 0}
+            for card in fresh:
+                self.queue.push(task["source"], "detail", job=card)
+        else:
+            written = scraper.write_jobs(scraper.details_stage(cards))
+        if written["failed"]:
+            raise RuntimeError(f"Upsert failed for {written['failed']} cards on page {page}")
+        if not caught_up and page + 1 < scraper.page_limit(scraper.pages):
+            self.queue.push(task["source"], "listing", page=page + 1)
+
+    def handle_detail(self, scraper, task):
+        job = scraper.enrich(task["job"])
+        if not job["detailed"]:
+            # fetch_detail swallows errors; fail the task so it is retried or dead-lettered
+            raise RuntimeError(f"Detail fetch failed for {job['url']}")
+        counts = scraper.write_jobs([job])
+        if counts["failed"]:
+            raise RuntimeError(f"Upsert failed for {job['url']}")
+
+    def process(self, task):
+        scraper = self.scraper(task["source"])
+        handler = self.handle_listing if task["kind"] == "listing" else self.handle_detail
+        try:
+            handler(scraper, task)
+        except Exception as e:
+            self.queue.fail(task, e)
+            return False
+        self.queue.ack(task)
+        return True
+
+    def run(self, idle_exit=False):
+        """Poll every source round-robin until stopped (or, with idle_exit, until no task is ready)."""
+        sources = list(self.classes)
+        while not self._stop.is_set():
+            worked = False
+            for source in sources:
+                task = self.queue.claim(source)
+                if task:
+                    worked = True
+                    self.process(task)
+            if not worked:
+                if idle_exit:
+                    return
+                self._stop.wait(POLL_INTERVAL)
+
+    def stop(self):
+        self._stop.set()
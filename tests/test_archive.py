@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from src import archive, base, db
+
+STORED = object()  # stands in for the PostgreSQL pool
+
+
+class ArchivedScraper(base.BaseClient):
+    """Listing pages are JSON lists of links; records each upsert batch."""
+
+    SOURCE = "Archived"
+    HAS_DETAIL = True
+    written = []
+
+    def parse(self, html):
+        return [{"url": url, "title": "Contract", "description": "snippet"} for url in json.loads(html)]
+
+    def parse_detail(self, html):
+        return html
+
+    def write_jobs(self, jobs):
+        self.written.append([job["url"] for job in jobs])
+        return {"new": len(jobs), "changed": 0, "unchanged": 0, "failed": 0}
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+    monkeypatch.setattr(db, "get_pg_pool", lambda pg_url=None: STORED)
+    monkeypatch.setattr(db, "get_redis", lambda redis_url=None: None)
+    monkeypatch.setattr(db, "ensure_schema", lambda pool, force=False: None)
+    monkeypatch.setattr(db, "known_links", lambda pool, candidates: calls.append(list(candidates)) or set())
+    monkeypatch.setattr(archive, "ARCHIVE_PAGES", False)
+    ArchivedScraper.written = []
+    return calls
+
+
+def test_reparse_upserts_each_batch_of_pages_separately(tmp_path, lookups):
+    store = archive.PageArchive(str(tmp_path))
+    for page in range(5):
+        links = [f"https://archived.invalid/{page}/{i}" for i in range(2)]
+        store.put("Archived", "listing", f"https://archived.invalid/?page={page}", json.dumps(links))
+    store.put("Archived", "detail", "https://archived.invalid/0/0", "full description")
+
+    results = archive.reparse({"Archived": ArchivedScraper}, store, workers=1, batch=2)
+
+    assert [len(batch) for batch in ArchivedScraper.written] == [4, 4, 2]
+    assert [len(links) for links in lookups] == [4, 4, 2]
+    assert results["Archived"] == {"parsed": 10, "new": 10, "changed": 0, "unchanged": 0, "failed": 0}
@@ -0,0 +1,130 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from psycopg2 import pool as pg_pool
+
+from src import db
+
+
+class FakeCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConnection:
+    def cursor(self):
+        return FakeCursor()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    """Behaves like ThreadedConnectionPool.getconn(): raises once maxconn are leased."""
+
+    def __init__(self, maxconn):
+        self.maxconn = maxconn
+        self.leased = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def getconn(self):
+        with self._lock:
+            if self.leased >= self.maxconn:
+                raise pg_pool.PoolError("connection pool exhausted")
+            self.leased += 1
+            self.peak = max(self.peak, self.leased)
+        return FakeConnection()
+
+    def putconn(self, conn):
+        with self._lock:
+            self.leased -= 1
+
+
+def test_pg_connection_waits_for_a_free_connection(monkeypatch):
+    pool = FakePool(maxconn=2)
+    monkeypatch.setitem(db._pg_slots, pool, threading.BoundedSemaphore(pool.maxconn))
+
+    def transaction(_):
+        with db.pg_connection(pool):
+            time.sleep(0.01)
+        return True
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(transaction, range(16)))
+    assert pool.peak == 2
+    assert pool.leased == 0
+
+
+class FakeJobsTable:
+    """
+    Stands in for execute_values against the jobs table: like UPSERT_SQL it
+    returns (inserted,) for new and changed rows and nothing for rows whose
+    content hash is unchanged.
+    """
+
+    def __init__(self):
+        self.rows = {}    # link -> content hash
+        self.bodies = {}  # description hash -> body
+        self.fail = False
+
+    def execute_values(self, cur, sql, values, page_size=None, fetch=False):
+        if sql == db.STORE_DESCRIPTIONS_SQL:
+            self.bodies.update(values)
+            return None
+        if self.fail:
+            self.fail = False
+            raise RuntimeError("deadlock detected")
+        flags = []
+        for value in values:
+            link, digest = value[3], value[-1]
+            if self.rows.get(link) == digest:
+                continue
+            flags.append((link not in self.rows,))
+            self.rows[link] = digest
+        return flags
+
+
+def job_row(link, title="Django Contractor", description="Six month contract"):
+    fields = {name: None for name in db.ROW_COLUMNS}
+    fields.update(company="Acme", title=title, description=description, link=link, source="Reed", needs_enrichment=False)
+    return tuple(fields[name] for name in db.ROW_COLUMNS)
+
+
+@pytest.fixture
+def jobs_table(monkeypatch):
+    table = FakeJobsTable()
+    monkeypatch.setattr(db, "execute_values", table.execute_values)
+    return table
+
+
+def test_upsert_counts_new_changed_and_unchanged(jobs_table):
+    pool = FakePool(maxconn=1)
+    rows = [job_row(f"https://reed.invalid/{i}") for i in range(3)]
+    assert db.upsert_jobs(pool, rows) == {"new": 3, "changed": 0, "unchanged": 0, "failed": 0}
+    assert db.upsert_jobs(pool, rows) == {"new": 0, "changed": 0, "unchanged": 3, "failed": 0}
+    rows[1] = job_row("https://reed.invalid/1", title="Senior Django Contractor")
+    assert db.upsert_jobs(pool, rows) == {"new": 0, "changed": 1, "unchanged": 2, "failed": 0}
+
+
+def test_upsert_stores_each_description_once(jobs_table):
+    rows = [job_row(f"https://reed.invalid/{i}", description="Same advert") for i in range(3)]
+    db.upsert_jobs(FakePool(maxconn=1), rows)
+    assert jobs_table.bodies == {db.description_hash("Same advert"): "Same advert"}
+
+
+def test_failed_batch_is_counted_and_later_batches_still_run(jobs_table):
+    rows = [job_row(f"https://reed.invalid/{i}") for i in range(5)]
+    committed = []
+    jobs_table.fail = True
+    counts = db.upsert_jobs(FakePool(maxconn=1), rows, batch_size=2, on_commit=committed.extend)
+    assert counts == {"new": 3, "changed": 0, "unchanged": 0, "failed": 2}
+    assert committed == [row[3] for row in rows[2:]]
@@ -0,0 +1,116 @@
+import pytest
+
+from src import dedup
+
+fakeredis = pytest.importorskip("fakeredis")
+
+SNIPPET = "Senior Python developer for a six month contract building Django APIs for a fintech client in London"
+
+
+def job(url, description=SNIPPET, title="Python Developer", company="Acme"):
+    return {"url": url, "title": title, "company": company, "description": description}
+
+
+@pytest.fixture
+def deduper():
+    return dedup.Deduper(fakeredis.FakeRedis(decode_responses=True))
+
+
+def test_first_posting_is_canonical(deduper):
+    first = job("https://reed.invalid/1")
+    deduper.assign([first], "Reed")
+    assert first["canonical"] == first["url"]
+    assert first["canonical_source"] == "Reed"
+    assert not dedup.Deduper.is_duplicate(first)
+
+
+def test_cross_source_posting_joins_canonical(deduper):
+    deduper.assign([job("https://reed.invalid/1")], "Reed")
+    repost = job("https://cwjobs.invalid/9")
+    deduper.assign([repost], "CWJobs")
+    assert repost["canonical"] == "https://reed.invalid/1"
+    assert repost["canonical_source"] == "Reed"
+    assert dedup.Deduper.is_duplicate(repost)
+
+
+def test_same_source_postings_stay_separate(deduper):
+    batch = [job("https://reed.invalid/1"), job("https://reed.invalid/2")]
+    deduper.assign(batch, "Reed")
+    later = job("https://reed.invalid/3")
+    deduper.assign([later], "Reed")
+    assert [j["canonical"] for j in batch + [later]] == [j["url"] for j in batch + [later]]
+
+
+def test_different_contracts_stay_separate(deduper):
+    deduper.assign([job("https://reed.invalid/1")], "Reed")
+    other = job("https://cwjobs.invalid/9", description="Data engineer needed to build Spark pipelines on AWS for a retail bank")
+    deduper.assign([other], "CWJobs")
+    assert other["canonical"] == other["url"]
+
+
+def test_jobs_without_snippet_are_left_unassigned(deduper):
+    deduper.assign([job("https://reed.invalid/1")], "Reed")
+    card = job("https://linkedin.invalid/5", description="")
+    deduper.assign([card], "LinkedIn")
+    assert "canonical" not in card
+    # matched once its full description is known
+    card["description"] = SNIPPET
+    deduper.assign([card], "LinkedIn")
+    assert card["canonical"] == "https://reed.invalid/1"
+
+
+def test_canonical_is_kept_once_assigned(deduper):
+    deduper.assign([job("https://reed.invalid/1")], "Reed")
+    deduper.assign([job("https://cwjobs.invalid/9")], "CWJobs")
+    again = job("https://cwjobs.invalid/9", description="Completely rewritten advert for a different role entirely now")
+    deduper.assign([again], "CWJobs")
+    assert again["canonical"] == "https://reed.invalid/1"
+    assert again["canonical_source"] == "Reed"
+
+
+def test_skips_detail_only_for_cross_source_matches(deduper, monkeypatch):
+    deduper.assign([job("https://reed.invalid/1")], "Reed")
+    repost = job("https://cwjobs.invalid/9")
+    deduper.assign([repost], "CWJobs")
+    assert not dedup.skips_detail(repost, "CWJobs")  # off by default
+    monkeypatch.setattr(dedup, "DEDUP_SKIP_DETAIL", True)
+    assert dedup.skips_detail(repost, "CWJobs")
+    assert not dedup.skips_detail({**repost, "description": ""}, "CWJobs")
+    assert not dedup.skips_detail({**repost, "canonical_source": "CWJobs"}, "CWJobs")
+
+
+FULL = (
+    "About the role: our client, a London fintech, needs an experienced Python engineer to design and "
+    "build Django REST APIs, own the CI pipeline and mentor two junior developers over a six month contract"
+)
+
+
+def test_canonical_is_resigned_when_its_full_description_arrives(deduper):
+    listed = job("https://reed.invalid/1")
+    deduper.assign([listed], "Reed")
+    listed.update(description=FULL, detailed=True)
+    deduper.assign([listed], "Reed")
+
+    repost = job("https://cwjobs.invalid/9", description=FULL)
+    deduper.assign([repost], "CWJobs")
+    assert repost["canonical"] == "https://reed.invalid/1"
+
+
+def test_links_not_listed_within_the_ttl_are_pruned():
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    deduper = dedup.Deduper(redis_client, ttl=3600)
+    deduper.assign([job("https://reed.invalid/1")], "Reed")
+    redis_client.zadd(deduper.touched_key, {"https://reed.invalid/1": 0})  # last listed long ago
+
+    other = job("https://cwjobs.invalid/9", description=FULL)
+    deduper.assign([other], "CWJobs")
+    for key in (deduper.canonical_key, deduper.sig_key, deduper.source_key):
+        assert not redis_client.hexists(key, "https://reed.invalid/1")
+    buckets = redis_client.keys("jobs:dedup:band:*")
+    assert not any("https://reed.invalid/1" in redis_client.smembers(key) for key in buckets)
+    assert redis_client.zscore(deduper.touched_key, "https://cwjobs.invalid/9")
+
+    # a posting of the pruned job is now canonical itself
+    repost = job("https://cwjobs.invalid/10")
+    deduper.assign([repost], "CWJobs")
+    assert repost["canonical"] == repost["url"]
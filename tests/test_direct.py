@@ -0,0 +1,43 @@
+import pytest
+import requests
+
+from src import direct
+
+
+class FakeSession:
+    def __init__(self, status, text="<html><body>jobs</body></html>"):
+        self.status = status
+        self.text = text
+
+    def get(self, url, timeout=None):
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp._content = self.text.encode("utf-8")
+        resp.encoding = "utf-8"
+        resp.url = url
+        return resp
+
+
+def test_ok_response_is_returned_with_its_body():
+    result = direct.fetch(FakeSession(200), "request.get", "https://example.invalid/jobs")
+    assert result["status"] == "ok"
+    assert result["solution"]["response"] == "<html><body>jobs</body></html>"
+
+
+@pytest.mark.parametrize("status", [500, 502, 504])
+def test_server_errors_fall_back_to_the_broker(status):
+    assert direct.fetch(FakeSession(status), "request.get", "https://example.invalid/jobs") is None
+    assert not direct.needs_broker("example.invalid")
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_client_errors_are_errors_without_a_body(status):
+    result = direct.fetch(FakeSession(status, "<h1>Not found</h1>"), "request.get", "https://example.invalid/gone")
+    assert result["status"] == "error"
+    assert "solution" not in result
+
+
+def test_block_pages_send_the_host_to_the_broker():
+    session = FakeSession(200, "<title>Just a moment...</title>")
+    assert direct.fetch(session, "request.get", "https://blocked.invalid/jobs") is None
+    assert direct.needs_broker("blocked.invalid")
@@ -0,0 +1,125 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from src import export
+
+NOW = datetime(2026, 10, 17, 12, 0)
+
+
+def job(job_id, minutes_ago):
+    values = {column: None for column in export.COLUMNS}
+    values.update(id=job_id, source="Reed", title=f"Contract {job_id}", updated_at=NOW - timedelta(minutes=minutes_ago))
+    return tuple(values[column] for column in export.COLUMNS)
+
+
+class ExportDatabase:
+    """The jobs rows and export_watermarks table as seen by export_jobs' SQL."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.watermarks = {}
+
+    def getconn(self):
+        return ExportConnection(self)
+
+    def putconn(self, conn):
+        pass
+
+
+class ExportConnection:
+    def __init__(self, database):
+        self.database = database
+
+    def cursor(self, name=None):
+        return ExportCursor(self.database)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class ExportCursor:
+    def __init__(self, database):
+        self.database = database
+        self.result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        database = self.database
+        if "FROM export_watermarks" in sql:
+            self.result = [database.watermarks[params[0]]] if params[0] in database.watermarks else []
+        elif "INSERT INTO export_watermarks" in sql:
+            name, updated_at, last_id = params
+            database.watermarks[name] = (updated_at, last_id)
+        else:
+            after_at, after_id, lag = params
+            after = (datetime.min if after_at == "-infinity" else after_at, after_id)
+            updated, ident = export.COLUMNS.index("updated_at"), export.COLUMNS.index("id")
+            self.result = sorted(
+                (row for row in database.rows
+                 if (row[updated], row[ident]) > after and row[updated] < NOW - timedelta(seconds=lag)),
+                key=lambda row: (row[updated], row[ident]),
+            )
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchmany(self, size):
+        batch, self.result = self.result[:size], self.result[size:]
+        return batch
+
+
+def exported(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["id"] for line in f]
+
+
+@pytest.fixture
+def database():
+    return ExportDatabase([job(1, 30), job(2, 20), job(3, 20)])
+
+
+def test_export_resumes_from_the_watermark(database, tmp_path):
+    path = str(tmp_path / "jobs.ndjson")
+    assert export.export_jobs(database, path, batch_size=2) == 3
+    assert exported(path) == [1, 2, 3]
+    assert database.watermarks["default"] == (NOW - timedelta(minutes=20), 3)
+
+    assert export.export_jobs(database, path) == 0
+    database.rows.append(job(4, 10))
+    assert export.export_jobs(database, path) == 1
+    assert exported(path) == [4]
+
+    assert export.export_jobs(database, path, full=True) == 4
+
+
+def test_rows_inside_the_lag_wait_for_the_next_export(database, tmp_path):
+    database.rows.append(job(4, 0))
+    export.export_jobs(database, str(tmp_path / "jobs.ndjson"))
+    assert exported(str(tmp_path / "jobs.ndjson")) == [1, 2, 3]
+
+
+def test_watermarks_are_per_consumer(database, tmp_path):
+    export.export_jobs(database, str(tmp_path / "a.ndjson"), name="warehouse")
+    assert export.export_jobs(database, str(tmp_path / "b.ndjson"), name="search") == 3
+
+
+def test_failed_export_leaves_no_file_and_keeps_the_watermark(database, tmp_path, monkeypatch):
+    def broken(self, rows):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(export.NdjsonWriter, "write", broken)
+    with pytest.raises(OSError):
+        export.export_jobs(database, str(tmp_path / "jobs.ndjson"))
+    assert os.listdir(tmp_path) == []
+    assert database.watermarks == {}
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pytest
+
+from src.normalize import parse_posted, parse_salary
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("£500 - £600 per day", (500.0, 600.0, "day")),
+    ("£500 - 600 per day", (500.0, 600.0, "day")),
+    ("Outside IR35 £450 - 550 per day", (450.0, 550.0, "day")),
+    ("£60k - 70k", (60000.0, 70000.0, "year")),
+    ("£60 - 70k", (60000.0, 70000.0, "year")),
+    ("£60,000 to £70,000 per annum", (60000.0, 70000.0, "year")),
+    ("£60k", (60000.0, 60000.0, "year")),
+    ("£1.5k per week", (1500.0, 1500.0, "week")),
+    ("£3,000 - £3,500 pcm", (3000.0, 3500.0, "month")),
+    ("£60k, 4 days a week in the office", (60000.0, 60000.0, "year")),
+    ("£45-£50 per hour", (45.0, 50.0, "hour")),
+    ("Up to £650/day (Inside IR35)", (650.0, 650.0, "day")),
+    ("6 month contract, £500 per day", (500.0, 500.0, "day")),
+    ("Competitive", (None, None, None)),
+    ("", (None, None, None)),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+
+NOW = datetime(2026, 10, 17, 15, 30)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2026-10-01", datetime(2026, 10, 1)),
+    ("17/10/2026 09:12", datetime(2026, 10, 17, 9, 12)),
+    ("2026-10-17T09:12:00+01:00", datetime(2026, 10, 17, 8, 12)),
+    ("2026-10-17T09:12:00Z", datetime(2026, 10, 17, 9, 12)),
+    ("3 days ago", datetime(2026, 10, 14)),
+    ("Posted 30+ days ago", datetime(2026, 9, 17)),
+    ("2 hours ago", datetime(2026, 10, 17, 13, 30)),
+    ("Yesterday", datetime(2026, 10, 16)),
+    ("Just posted", datetime(2026, 10, 17)),
+    ("whenever", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_posted(text, expected):
+    assert parse_posted(text, NOW) == expected
@@ -0,0 +1,66 @@
+import pytest
+
+from src import archive, base, db
+
+fakeredis = pytest.importorskip("fakeredis")
+
+STORED = object()  # stands in for the PostgreSQL pool
+
+
+class PagedScraper(base.BaseClient):
+    """Three listing pages of three cards each; records which pages were fetched."""
+
+    SOURCE = "Paged"
+
+    def __init__(self):
+        super().__init__()
+        self.fetched = []
+
+    def iter_pages(self):
+        for page in range(3):
+            self.fetched.append(page)
+            yield page
+
+    def parse(self, page):
+        return [{"url": f"https://paged.invalid/{page}/{i}", "title": "Contract"} for i in range(3)]
+
+
+@pytest.fixture
+def stored_links(monkeypatch):
+    links = set()
+    monkeypatch.setattr(db, "get_pg_pool", lambda pg_url=None: STORED)
+    monkeypatch.setattr(db, "get_redis", lambda redis_url=None: fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(db, "ensure_schema", lambda pool, force=False: None)
+    monkeypatch.setattr(db, "known_links", lambda pool, candidates: links & set(candidates))
+    monkeypatch.setattr(archive, "ARCHIVE_PAGES", False)
+    return links
+
+
+def test_incremental_crawl_stops_after_a_mostly_known_page(stored_links):
+    stored_links.update(f"https://paged.invalid/1/{i}" for i in range(3))
+    scraper = PagedScraper()
+    jobs = list(scraper.iter_jobs())
+    assert scraper.fetched == [0, 1]
+    assert len(jobs) == 6  # the known page itself is still written
+    assert scraper.watermarks.get("Paged") == "https://paged.invalid/0/0"
+
+
+def test_incremental_crawl_stops_at_the_watermark(stored_links):
+    scraper = PagedScraper()
+    scraper.watermarks.set("Paged", "https://paged.invalid/0/2")
+    list(scraper.iter_jobs())
+    assert scraper.fetched == [0]
+
+
+def test_crawl_with_nothing_stored_walks_every_page(stored_links):
+    scraper = PagedScraper()
+    list(scraper.iter_jobs())
+    assert scraper.fetched == [0, 1, 2]
+
+
+def test_full_crawl_ignores_known_listings(stored_links):
+    stored_links.update(f"https://paged.invalid/0/{i}" for i in range(3))
+    scraper = PagedScraper()
+    scraper.crawl_mode = "full"
+    list(scraper.iter_jobs())
+    assert scraper.fetched == [0, 1, 2]
@@ -0,0 +1,24 @@
+import argparse
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+
+import main
+from bench.fake_broker import load_fixture
+from src import reed
+
+
+def parse_on_pool():
+    scraper = reed.ReedScraper.__new__(reed.ReedScraper)  # parse() needs no clients
+    listing = load_fixture("reed_listing.html")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        return [len(f.result()) for f in [pool.submit(scraper.parse, listing) for _ in range(4)]]
+
+
+def test_profile_includes_worker_threads(tmp_path):
+    path = str(tmp_path / "run.prof")
+    args = argparse.Namespace(metrics_port=None, metrics_file=None, report=None, profile=path, command="run")
+    assert all(main.instrumented(args, parse_on_pool))
+
+    functions = {(filename.replace("\\", "/"), name) for filename, _, name in pstats.Stats(path).stats}
+    assert any(filename.endswith("src/reed.py") and name == "parse" for filename, name in functions)
+    assert any(filename.endswith("src/parsing.py") and name == "parse_html" for filename, name in functions)
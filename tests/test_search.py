@@ -0,0 +1,99 @@
+from datetime import datetime
+
+from src import search
+
+POSTED = datetime(2026, 10, 17, 9, 0)
+# jobs 3 and 4 share a posting time, so only the id orders them
+HOURS = {1: 10, 2: 11, 3: 12, 4: 12, 5: 13, 6: 14}
+JOBS = [
+    {"id": i, "source": "Reed" if i % 2 else "CWJobs", "date_posted": POSTED.replace(hour=hour)}
+    for i, hour in HOURS.items()
+]
+
+
+class JobsCursor:
+    """Answers search_jobs' SELECT over JOBS for the source and keyset clauses it emits."""
+
+    def __init__(self, log):
+        self.log = log
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.log.append((sql, params))
+        params = list(params)
+        rows = sorted(JOBS, key=lambda job: (job["date_posted"], job["id"]), reverse=True)
+        if "source = %s" in sql:
+            source = params.pop(0)
+            rows = [job for job in rows if job["source"] == source]
+        if "(date_posted, id) < (%s, %s)" in sql:
+            after = (params.pop(0), params.pop(0))
+            rows = [job for job in rows if (job["date_posted"], job["id"]) < after]
+        limit = params.pop(0)
+        self.rows = [tuple(job.get(column) for column in search_columns(sql)) for job in rows[:limit]]
+
+    def fetchall(self):
+        return self.rows
+
+
+def search_columns(sql):
+    return [column.strip() for column in sql.split("SELECT", 1)[1].split("FROM", 1)[0].split(",")]
+
+
+class JobsPool:
+    def __init__(self):
+        self.log = []
+
+    def getconn(self):
+        pool = self
+
+        class Connection:
+            def cursor(self):
+                return JobsCursor(pool.log)
+
+            def commit(self):
+                pass
+
+            def rollback(self):
+                pass
+
+        return Connection()
+
+    def putconn(self, conn):
+        pass
+
+
+def walk(pool, **kwargs):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = search.search_jobs(pool, after=cursor, **kwargs)
+        pages.append([row["id"] for row in rows])
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_cover_every_job_once_newest_first():
+    pool = JobsPool()
+    assert walk(pool, limit=2) == [[6, 5], [4, 3], [2, 1]]
+    # one extra row is asked for to know whether another page exists
+    assert all(params[-1] == 3 for _, params in pool.log)
+
+
+def test_keyset_pages_with_a_filter():
+    assert walk(JobsPool(), limit=2, source="Reed") == [[5, 3], [1]]
+
+
+def test_cursor_round_trip():
+    cursor = search.encode_cursor({"date_posted": POSTED, "id": 42})
+    assert search.decode_cursor(cursor) == (POSTED, 42)
+
+
+def test_last_page_has_no_cursor():
+    rows, cursor = search.search_jobs(JobsPool(), limit=10)
+    assert len(rows) == 6
+    assert cursor is None
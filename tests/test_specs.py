@@ -0,0 +1,64 @@
+import html
+
+import pytest
+
+from bench.fake_broker import load_fixture
+from src import cvlibrary, cwjobs, jobserve, specs
+from src.parsing import parse_html
+
+SPEC_SCRAPERS = [
+    (cvlibrary.CVLibraryScraper, "cvlibrary_listing.html"),
+    (cwjobs.CWJobsScraper, "cwjobs_listing.html"),
+    (jobserve.JobServeScraper, "jobserve_listing.html"),
+]
+
+
+@pytest.mark.parametrize("scraper, fixture", SPEC_SCRAPERS)
+def test_single_pass_matches_select_one(scraper, fixture):
+    spec = scraper.SPEC
+    html_text = load_fixture(fixture)
+    if spec.unescape:
+        html_text = html.unescape(html_text)
+    cards = parse_html(html_text, only=spec.only).select(spec.card)
+    assert cards
+    for card in cards:
+        found = spec.matcher.find(card)
+        for field in spec.fields.values():
+            expected = card.select_one(field.css)
+            if expected is None:
+                assert field.css not in found
+            elif field.attr:
+                assert found[field.css].attr(field.attr) == expected.attr(field.attr)
+            else:
+                assert found[field.css].text(field.sep) == expected.text(field.sep)
+
+
+@pytest.mark.parametrize("scraper, fixture", SPEC_SCRAPERS)
+def test_parse_cards_builds_absolute_links(scraper, fixture):
+    jobs = specs.parse_cards(scraper.SPEC, load_fixture(fixture))
+    assert jobs
+    assert all(job["url"].startswith("http") and job["title"] for job in jobs)
+    assert set(jobs[0]) == set(scraper.SPEC.fields)
+
+
+def test_matcher_handles_combinators_and_attribute_operators():
+    card = parse_html(
+        '<div class="card"><ul><li><a class="x y" href="/a" data-k="job-12">A</a></li></ul>'
+        '<p><span class="y">B</span></p></div>'
+    ).select_one("div.card")
+    fields = {
+        "child": specs.Field("li > a"),
+        "descendant": specs.Field("ul a.y"),
+        "prefix": specs.Field('a[data-k^="job-"]', attr="href"),
+        "word": specs.Field("[class~=y]"),
+        "missing": specs.Field("ul > a"),
+    }
+    assert specs.CardMatcher(fields).extract(card) == {
+        "child": "A", "descendant": "A", "prefix": "/a", "word": "A", "missing": "",
+    }
+
+
+def test_unsupported_selectors_fall_back_to_select_one():
+    assert specs.compile_selector("li:nth-child(2) a") is None
+    card = parse_html("<div><ul><li>one</li><li>two</li></ul></div>").select_one("div")
+    assert specs.CardMatcher({"second": specs.Field("li:nth-child(2)")}).extract(card) == {"second": "two"}
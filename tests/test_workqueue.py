@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from src import workqueue
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis runs the claim script with it
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def queue(redis_client):
+    return workqueue.WorkQueue(redis_client)
+
+
+def test_claim_hides_task_until_acked(queue):
+    task_id = queue.push("Reed", "listing", page=0)
+    task = queue.claim("Reed")
+    assert (task["id"], task["kind"], task["page"], task["attempts"]) == (task_id, "listing", 0, 1)
+    assert queue.claim("Reed") is None
+    queue.ack(task)
+    assert queue.stats(["Reed"])["Reed"] == {"ready": 0, "scheduled_or_in_flight": 0, "dead": 0}
+
+
+def test_unacked_task_reappears_after_visibility_timeout(queue):
+    queue.push("Reed", "listing", page=0)
+    first = queue.claim("Reed", visibility=0)
+    again = queue.claim("Reed")
+    assert again["id"] == first["id"]
+    assert again["attempts"] == 2
+
+
+def test_delayed_task_is_not_claimed_early(queue):
+    queue.push("Reed", "listing", delay=60, page=0)
+    assert queue.claim("Reed") is None
+
+
+def test_failed_task_is_retried_with_backoff(queue):
+    queue.push("Reed", "detail", job={"url": "https://reed.invalid/1"})
+    task = queue.claim("Reed")
+    queue.fail(task, RuntimeError("boom"))
+    assert queue.claim("Reed") is None  # backing off
+    assert queue.stats(["Reed"])["Reed"]["scheduled_or_in_flight"] == 1
+
+
+def test_task_is_dead_lettered_after_max_attempts(queue, redis_client, monkeypatch):
+    monkeypatch.setattr(workqueue, "RETRY_BASE", 0)
+    queue.push("Reed", "detail", job={"url": "https://reed.invalid/1"})
+    for attempt in range(1, workqueue.MAX_ATTEMPTS + 1):
+        task = queue.claim("Reed")
+        assert task["attempts"] == attempt
+        queue.fail(task, RuntimeError("boom"))
+    assert queue.claim("Reed") is None
+    assert queue.stats(["Reed"])["Reed"] == {"ready": 0, "scheduled_or_in_flight": 0, "dead": 1}
+    dead = json.loads(redis_client.lindex("jobs:queue:Reed:dead", 0))
+    assert dead["error"] == "boom"
+    assert dead["job"] == {"url": "https://reed.invalid/1"}
+
+    assert queue.requeue_dead("Reed") == 1
+    task = queue.claim("Reed")
+    assert (task["kind"], task["job"], task["attempts"]) == ("detail", {"url": "https://reed.invalid/1"}, 1)
+
+
+class FailingDetailScraper:
+    def enrich(self, job):
+        job["detailed"] = False
+        return job
+
+    def write_jobs(self, jobs):
+        raise AssertionError("a failed fetch must not be written")
+
+
+def test_failed_detail_fetch_fails_the_task(queue):
+    worker = workqueue.Worker(queue, {})
+    with pytest.raises(RuntimeError):
+        worker.handle_detail(FailingDetailScraper(), {"job": {"url": "https://reed.invalid/1"}})